@@ -0,0 +1,106 @@
+"""
+Conversión de animaciones (GIF animados) a WebP animado.
+
+Los fotogramas se decodifican y codifican de uno en uno: Pillow va avanzando
+por el GIF con `seek()` mientras el codificador de animaciones WebP recibe cada
+fotograma, así que la memoria no crece con el número de fotogramas. Las
+duraciones se leen directamente de las cabeceras del GIF, sin decodificar.
+"""
+
+import io
+import struct
+
+def _skip_sub_blocks(f):
+    """Salta una secuencia de sub-bloques de datos GIF (terminada en un bloque de tamaño 0)."""
+    while True:
+        size = f.read(1)
+        if not size or size[0] == 0:
+            return
+        f.seek(size[0], 1)
+
+def gif_frame_durations(gif_path):
+    """
+    Lee la duración (ms) de cada fotograma de un GIF sin decodificar ninguna imagen.
+
+    Recorre los bloques del archivo leyendo solo las extensiones de control
+    gráfico; los datos LZW de cada fotograma se saltan. Un fotograma sin
+    extensión de control dura 0 ms, igual que en Pillow. `gif_path` puede ser
+    también el contenido del GIF ya leído en memoria (bytes).
+    """
+    durations = []
+    if isinstance(gif_path, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(gif_path)
+    else:
+        source = open(gif_path, "rb")
+    with source as f:
+        header = f.read(13)
+        if len(header) < 13 or header[:3] != b"GIF":
+            raise ValueError(f"No es un archivo GIF: {gif_path}")
+
+        flags = header[10]
+        if flags & 0x80:
+            f.seek(3 * (2 ** ((flags & 0x07) + 1)), 1)
+
+        pending_duration = 0
+        while True:
+            block = f.read(1)
+            if not block or block == b";":
+                break
+
+            if block == b"!":
+                label = f.read(1)
+                if label == b"\xf9":
+                    data = f.read(f.read(1)[0])
+                    pending_duration = struct.unpack("<H", data[1:3])[0] * 10
+                    _skip_sub_blocks(f)
+                else:
+                    _skip_sub_blocks(f)
+
+            elif block == b",":
+                descriptor = f.read(9)
+                if descriptor[8] & 0x80:
+                    f.seek(3 * (2 ** ((descriptor[8] & 0x07) + 1)), 1)
+                f.read(1)  # tamaño mínimo del código LZW
+                _skip_sub_blocks(f)
+                durations.append(pending_duration)
+                pending_duration = 0
+
+            else:
+                break
+
+    return durations
+
+def is_animated(img):
+    """Indica si una imagen abierta con Pillow tiene más de un fotograma."""
+    return getattr(img, "is_animated", False)
+
+def save_animated_webp(img, output_image_path, params, source_path=None):
+    """
+    Guarda una imagen animada de Pillow como WebP animado.
+
+    Conserva la duración de cada fotograma y el número de repeticiones. Un GIF
+    sin extensión NETSCAPE se reproduce una sola vez, así que en ese caso se
+    escribe `loop=1` (en WebP, 0 significa repetir indefinidamente).
+
+    Args:
+        img: Imagen animada abierta con Pillow
+        output_image_path (str): Ruta del WebP de salida
+        params (dict): Parámetros de codificación del perfil
+        source_path (str): Ruta (o contenido en bytes) del archivo original, para
+            leer las duraciones del GIF
+    """
+    if img.format == "GIF" and source_path is not None:
+        durations = gif_frame_durations(source_path)
+        if len(durations) != img.n_frames:
+            durations = img.info.get("duration", 0)
+    else:
+        durations = img.info.get("duration", 0)
+
+    img.save(
+        output_image_path,
+        "WEBP",
+        save_all=True,
+        duration=durations,
+        loop=img.info.get("loop", 1),
+        **params,
+    )
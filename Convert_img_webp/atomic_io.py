@@ -0,0 +1,135 @@
+"""
+Escritura atómica de las imágenes de salida.
+
+Cada salida se escribe primero en un archivo temporal de la misma carpeta
+(`nombre.webp.<pid>.tmp`) y se renombra al terminar, así que nunca queda a la
+vista un WebP a medio escribir: si el proceso muere, lo que queda es un
+temporal huérfano que `sweep_temp_files` elimina en la siguiente ejecución.
+El renombrado tampoco modifica el archivo anterior, lo que protege también a
+las salidas enlazadas con la caché de deduplicación.
+"""
+
+import contextlib
+import os
+import pathlib
+import re
+import time
+
+from config import TEMP_ORPHAN_AGE
+
+_TEMP_NAME = re.compile(r"^.+\.webp\.(\d+)\.tmp$")
+
+def temp_path(path):
+    """Ruta temporal de `path` para el proceso actual."""
+    path = pathlib.Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+def fsync_file(path):
+    """Fuerza a disco el contenido de un archivo."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def fsync_dir(directory):
+    """Fuerza a disco una carpeta (sus renombrados); en Windows no es posible y se omite."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextlib.contextmanager
+def atomic_output(path, fsync=False):
+    """
+    Entrega una ruta temporal donde escribir `path`; al salir del bloque sin
+    errores la renombra a `path`, y si hay un error la elimina.
+
+    Con `fsync=True` el archivo (y su carpeta, tras el renombrado) se fuerzan a
+    disco antes de dar la escritura por terminada.
+    """
+    path = pathlib.Path(path)
+    tmp = temp_path(path)
+    try:
+        yield tmp
+        if fsync:
+            fsync_file(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    if fsync:
+        fsync_dir(path.parent)
+
+def sync_outputs(paths):
+    """Fuerza a disco un lote de salidas y sus carpetas (política 'batch')."""
+    directories = set()
+    for path in paths:
+        with contextlib.suppress(FileNotFoundError):
+            fsync_file(path)
+        directories.add(pathlib.Path(path).parent)
+    for directory in directories:
+        fsync_dir(directory)
+
+def _pid_alive(pid):
+    """True/False si se puede saber si el proceso existe; None si no (Windows)."""
+    if os.name == "nt":
+        # En Windows os.kill terminaría el proceso en lugar de consultarlo
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+def sweep_temp_files(folder, recursive=True, max_age=TEMP_ORPHAN_AGE):
+    """
+    Elimina los temporales huérfanos de `folder`: aquellos cuyo proceso ya no
+    existe o, si eso no se puede saber, con más de `max_age` segundos.
+
+    Returns:
+        list: Rutas eliminadas
+    """
+    removed = []
+    now = time.time()
+    stack = [os.fspath(folder)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    stack.append(entry.path)
+                continue
+            match = _TEMP_NAME.match(entry.name)
+            if not match:
+                continue
+            alive = _pid_alive(int(match.group(1)))
+            if alive is None:
+                try:
+                    alive = now - entry.stat().st_mtime < max_age
+                except OSError:
+                    continue
+            if alive:
+                continue
+            try:
+                os.remove(entry.path)
+                removed.append(pathlib.Path(entry.path))
+            except OSError as e:
+                print(f"No se pudo eliminar el temporal {entry.path}: {e}")
+    return removed
@@ -0,0 +1,614 @@
+"""
+Benchmarks del conversor de imágenes a WebP.
+
+Cada medición se ejecuta en un proceso hijo nuevo, de modo que el pico de
+memoria (RSS) que se informa corresponde solo a esa conversión. Los datos
+sintéticos también se generan en un proceso aparte: en Linux el hijo hereda el
+pico de memoria del padre, y generar un GIF grande en el proceso principal
+falsearía las mediciones.
+
+Uso:
+    python benchmark.py animated [archivo.gif ...] [--frames N] [--json salida.json]
+    python benchmark.py mmap [imagen ...] [--count N] [--repeat N] [--json salida.json]
+    python benchmark.py suite [--sizes small,medium] [--workers 1,4] [--profiles fast,balanced]
+                              [--json salida.json]
+    python benchmark.py compare antes.json despues.json
+    python benchmark.py metadata [foto.jpg ...] [--count N] [--repeat N] [--json salida.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pathlib
+import platform
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PIL
+from PIL import Image, ImageCms, ImageDraw, ImageFile, ImageFilter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from config import DEFAULT_PROFILE, DEFAULT_WORKERS, ENCODE_PROFILES
+from converter_img_webp import convert_image_to_webp, iter_convert_folder
+
+# Tamaños de los corpus sintéticos del benchmark completo
+CORPUS_SIZES = {
+    "small": (640, 480),
+    "medium": (1920, 1080),
+    "large": (4000, 3000),
+}
+CORPUS_KINDS = ["photo", "flat", "alpha", "animated"]
+CORPUS_SEED = 1234
+
+def peak_rss_mb(children=False):
+    """
+    Pico de memoria residente del proceso actual en MB (None si no se puede medir).
+    Con `children=True`, el mayor pico de sus procesos hijos ya terminados.
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+def _timed_conversion(input_image_path, output_image_path, profile, use_mmap=False):
+    start = time.perf_counter()
+    convert_image_to_webp(input_image_path, output_image_path, profile, use_mmap=use_mmap)
+    return time.perf_counter() - start, peak_rss_mb()
+
+def _timed_batch(image_paths, output_dir, profile, use_mmap, max_dimension):
+    """Convierte los archivos uno tras otro y devuelve el tiempo de cada uno y el pico RSS."""
+    times = []
+    for path in image_paths:
+        output = pathlib.Path(output_dir) / (pathlib.Path(path).stem + ".webp")
+        start = time.perf_counter()
+        convert_image_to_webp(path, output, profile, max_dimension, use_mmap=use_mmap)
+        times.append(time.perf_counter() - start)
+    return times, peak_rss_mb()
+
+def run_isolated(func, *args):
+    """
+    Ejecuta `func(*args)` en un proceso hijo recién creado y devuelve su resultado.
+    El hijo no es un proceso daemon, así que puede crear su propio pool.
+    """
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+def make_animated_gif(path, frames=120, size=(480, 360)):
+    """Genera un GIF animado sintético (una figura que se desplaza sobre un degradado)."""
+    width, height = size
+    background = Image.linear_gradient("L").resize(size).convert("RGB")
+
+    def frame_iter():
+        for i in range(frames):
+            frame = background.copy()
+            draw = ImageDraw.Draw(frame)
+            x = (i * 7) % width
+            draw.ellipse((x, height // 3, x + 60, height // 3 + 60), fill=(220, 40, 40))
+            draw.text((10, 10), f"frame {i}", fill=(255, 255, 255))
+            yield frame.quantize(colors=64)
+
+    first, *rest = frame_iter()
+    first.save(path, save_all=True, append_images=rest, duration=40, loop=0)
+    return path
+
+def make_still_images(folder, count=6, size=(4000, 3000)):
+    """Genera imágenes fijas sintéticas grandes en PNG, BMP y TIFF (sin comprimir)."""
+    folder = pathlib.Path(folder)
+    base = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", (base, base.transpose(Image.Transpose.ROTATE_180), base.rotate(90)))
+    paths = []
+    for i in range(count):
+        ext = (".png", ".bmp", ".tif")[i % 3]
+        path = folder / f"imagen_{i}{ext}"
+        image.save(path)
+        paths.append(path)
+    return paths
+
+def benchmark_mmap(image_paths, profile="fast", repeat=3, max_dimension=1024):
+    """
+    Compara la lectura normal del origen con la lectura mapeada en memoria.
+
+    Cada modo convierte todos los archivos `repeat` veces en un proceso nuevo (se
+    alternan para que la caché de páginas favorezca a ambos por igual) y se toma
+    la mejor pasada. Por defecto se usa el perfil más rápido y una reducción, para
+    que la lectura y la decodificación pesen más que la codificación.
+
+    Returns:
+        dict: Resultados por modo ('buffered' y 'mmap')
+    """
+    image_paths = [str(p) for p in image_paths]
+    total_bytes = sum(os.path.getsize(p) for p in image_paths)
+    runs = {'buffered': [], 'mmap': []}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(repeat):
+            for mode in runs:
+                runs[mode].append(run_isolated(
+                    _timed_batch, image_paths, tmp_dir, profile, mode == 'mmap', max_dimension
+                ))
+
+    results = {}
+    for mode, mode_runs in runs.items():
+        times, peak_rss = min(mode_runs, key=lambda run: sum(run[0]))
+        total = sum(times)
+        results[mode] = {
+            'files': len(times),
+            'bytes': total_bytes,
+            'seconds': total,
+            'per_file_ms': total / len(times) * 1000,
+            'mb_per_second': total_bytes / (1024 * 1024) / total if total else None,
+            'peak_rss_mb': peak_rss,
+        }
+    results['speedup'] = results['buffered']['seconds'] / results['mmap']['seconds']
+    return results
+
+def _noise(rng, size):
+    return Image.frombytes("L", size, rng.randbytes(size[0] * size[1]))
+
+def make_corpus(folder, sizes=("small", "medium"), count=2, seed=CORPUS_SEED):
+    """
+    Genera un corpus sintético reproducible: para cada tamaño, `count` imágenes
+    de cada tipo (ver `CORPUS_KINDS`):
+
+     - photo: degradados con ruido suavizado, en JPEG (contenido fotográfico)
+     - flat: figuras de colores planos, en PNG (gráficos, capturas)
+     - alpha: PNG RGBA con transparencia graduada
+     - animated: GIF animado de 20 fotogramas
+
+    Con la misma semilla se obtienen siempre los mismos archivos.
+
+    Returns:
+        list: Rutas de los archivos generados
+    """
+    folder = pathlib.Path(folder)
+    rng = random.Random(seed)
+    paths = []
+    for size_name in sizes:
+        size = CORPUS_SIZES[size_name]
+        width, height = size
+        gradient = Image.linear_gradient("L").resize(size)
+        for i in range(count):
+            stem = f"{size_name}_{i}"
+
+            noise = _noise(rng, size).filter(ImageFilter.GaussianBlur(2))
+            photo = Image.merge("RGB", (
+                Image.blend(gradient, noise, 0.5),
+                Image.blend(gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT), noise, 0.3),
+                noise,
+            ))
+            path = folder / f"photo_{stem}.jpg"
+            photo.save(path, quality=90)
+            paths.append(path)
+
+            flat = Image.new("RGB", size, (245, 245, 245))
+            draw = ImageDraw.Draw(flat)
+            for _ in range(40):
+                x, y = rng.randrange(width), rng.randrange(height)
+                w, h = rng.randrange(width // 4), rng.randrange(height // 4)
+                color = tuple(rng.randrange(256) for _ in range(3))
+                shape = draw.rectangle if rng.random() < 0.5 else draw.ellipse
+                shape((x, y, x + w, y + h), fill=color)
+            path = folder / f"flat_{stem}.png"
+            flat.save(path)
+            paths.append(path)
+
+            alpha = flat.convert("RGBA")
+            alpha.putalpha(Image.radial_gradient("L").resize(size))
+            path = folder / f"alpha_{stem}.png"
+            alpha.save(path)
+            paths.append(path)
+
+            path = folder / f"animated_{stem}.gif"
+            make_animated_gif(path, frames=20, size=size)
+            paths.append(path)
+    return paths
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano (`fraction` entre 0 y 1)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+def _metrics(latencies, wall_seconds, total_bytes):
+    """Métricas comunes: archivos/s, MB/s y latencia p50/p95 por archivo (ms)."""
+    return {
+        'files': len(latencies),
+        'bytes': total_bytes,
+        'wall_seconds': wall_seconds,
+        'files_per_second': len(latencies) / wall_seconds if wall_seconds else None,
+        'mb_per_second': total_bytes / (1024 * 1024) / wall_seconds if wall_seconds else None,
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else None,
+        'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else None,
+    }
+
+def _timed_files(image_paths, output_dir, profile):
+    """Convierte los archivos uno a uno con `convert_image_to_webp`."""
+    timings = []
+    start = time.perf_counter()
+    for path in image_paths:
+        output = pathlib.Path(output_dir) / (pathlib.Path(path).stem + ".webp")
+        file_start = time.perf_counter()
+        convert_image_to_webp(path, output, profile)
+        timings.append((str(path), time.perf_counter() - file_start))
+    return timings, time.perf_counter() - start, peak_rss_mb()
+
+def _timed_folder(input_folder, output_folder, workers, profile):
+    """Convierte la carpeta con `iter_convert_folder` y mide el conjunto."""
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    for result in iter_convert_folder(input_folder, output_folder, workers, profile=profile):
+        latencies.append(result['encode_time'])
+        failed += result['status'] == 'failed'
+    wall = time.perf_counter() - start
+    return latencies, failed, wall, peak_rss_mb(), peak_rss_mb(children=True)
+
+def benchmark_suite(corpus_folder, profiles=(DEFAULT_PROFILE,), workers_list=(1, DEFAULT_WORKERS)):
+    """
+    Mide `convert_image_to_webp` (archivo a archivo) y la conversión de carpeta
+    con cada combinación de perfil y número de procesos, cada una en un proceso
+    nuevo.
+
+    Returns:
+        dict: {'single': [...], 'folder': [...]} con las métricas de `_metrics`
+        más el pico de memoria de cada medición
+    """
+    paths = sorted(str(p) for p in pathlib.Path(corpus_folder).iterdir())
+    sizes = {p: os.path.getsize(p) for p in paths}
+    total_bytes = sum(sizes.values())
+    results = {'single': [], 'folder': []}
+
+    for profile in profiles:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            timings, wall, peak_rss = run_isolated(_timed_files, paths, tmp_dir, profile)
+        by_kind = {}
+        for kind in CORPUS_KINDS:
+            kind_timings = [t for p, t in timings if pathlib.Path(p).name.startswith(kind + "_")]
+            if kind_timings:
+                kind_bytes = sum(sizes[p] for p, _ in timings if pathlib.Path(p).name.startswith(kind + "_"))
+                by_kind[kind] = _metrics(kind_timings, sum(kind_timings), kind_bytes)
+        results['single'].append(dict(
+            _metrics([t for _, t in timings], wall, total_bytes),
+            profile=profile,
+            peak_rss_mb=peak_rss,
+            by_kind=by_kind,
+        ))
+
+        for workers in workers_list:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                latencies, failed, wall, peak_rss, peak_worker_rss = run_isolated(
+                    _timed_folder, corpus_folder, tmp_dir, workers, profile
+                )
+            results['folder'].append(dict(
+                _metrics(latencies, wall, total_bytes),
+                profile=profile,
+                workers=workers,
+                failed=failed,
+                peak_rss_mb=peak_rss,
+                peak_worker_rss_mb=peak_worker_rss,
+            ))
+    return results
+
+def environment_info():
+    """Datos del entorno para poder interpretar y comparar resultados."""
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare_results(before, after):
+    """
+    Compara dos resultados de `suite` y devuelve una lista de
+    (medición, métrica, antes, después, variación relativa).
+    """
+    rows = []
+    sections = (
+        ('single', lambda r: r['profile']),
+        ('folder', lambda r: f"{r['profile']}/{r['workers']}p"),
+    )
+    for section, label in sections:
+        previous = {label(r): r for r in before.get(section, [])}
+        for current in after.get(section, []):
+            old = previous.get(label(current))
+            if old is None:
+                continue
+            for metric in ('files_per_second', 'mb_per_second', 'p50_ms', 'p95_ms', 'peak_rss_mb',
+                           'peak_worker_rss_mb'):
+                a, b = old.get(metric), current.get(metric)
+                if a and b is not None:
+                    rows.append((f"{section} {label(current)}", metric, a, b, (b - a) / a))
+    return rows
+
+# Modos medidos por el benchmark de metadatos: (keep_metadata, auto_orient)
+METADATA_MODES = {
+    "plain": (False, False),
+    "keep_metadata": (True, False),
+    "auto_orient": (False, True),
+    "both": (True, True),
+}
+
+def make_phone_photos(folder, count=6, size=(4032, 3024)):
+    """
+    Genera fotos JPEG sintéticas como las de un móvil: EXIF con orientación 6
+    (girada 90°), perfil ICC sRGB y un bloque XMP.
+    """
+    folder = pathlib.Path(folder)
+    base = Image.linear_gradient("L").resize(size)
+    photo = Image.merge("RGB", (base, base.transpose(Image.Transpose.ROTATE_180), base))
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Benchmark"
+    exif[0x0110] = "Sintética"
+    icc_profile = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    xmp = b'<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF/></x:xmpmeta>'
+    paths = []
+    for i in range(count):
+        path = folder / f"movil_{i}.jpg"
+        photo.save(path, quality=90, exif=exif, icc_profile=icc_profile, xmp=xmp)
+        paths.append(path)
+    return paths
+
+def _timed_metadata(image_paths, output_dir, profile, max_dimension, keep_metadata, auto_orient):
+    """
+    Convierte los archivos con las opciones de metadatos indicadas y cuenta
+    cuántas veces se decodifica una imagen (llamadas a `load` que decodifican).
+    """
+    decodes = 0
+    original_load = ImageFile.ImageFile.load
+
+    def counting_load(self):
+        nonlocal decodes
+        if self.tile:
+            decodes += 1
+        return original_load(self)
+
+    ImageFile.ImageFile.load = counting_load
+    times = []
+    output_bytes = 0
+    for path in image_paths:
+        output = pathlib.Path(output_dir) / (pathlib.Path(path).stem + ".webp")
+        start = time.perf_counter()
+        convert_image_to_webp(
+            path, output, profile, max_dimension,
+            keep_metadata=keep_metadata, auto_orient=auto_orient,
+        )
+        times.append(time.perf_counter() - start)
+        output_bytes += output.stat().st_size
+    return times, output_bytes, decodes, peak_rss_mb()
+
+def benchmark_metadata(image_paths, profile=DEFAULT_PROFILE, repeat=3, max_dimension=None):
+    """
+    Coste de conservar los metadatos y de aplicar la orientación EXIF frente a
+    una conversión sin ellos. Cada modo se mide `repeat` veces en procesos nuevos
+    y se toma la mejor pasada.
+
+    Returns:
+        dict: Resultados por modo (ver `METADATA_MODES`), con la sobrecarga de
+        tiempo respecto a 'plain' y las decodificaciones por archivo
+    """
+    image_paths = [str(p) for p in image_paths]
+    runs = {mode: [] for mode in METADATA_MODES}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(repeat):
+            for mode, (keep_metadata, auto_orient) in METADATA_MODES.items():
+                runs[mode].append(run_isolated(
+                    _timed_metadata, image_paths, tmp_dir, profile, max_dimension,
+                    keep_metadata, auto_orient,
+                ))
+
+    results = {}
+    for mode, mode_runs in runs.items():
+        times, output_bytes, decodes, peak_rss = min(mode_runs, key=lambda run: sum(run[0]))
+        results[mode] = {
+            'files': len(times),
+            'seconds': sum(times),
+            'per_file_ms': sum(times) / len(times) * 1000,
+            'p95_ms': percentile(times, 0.95) * 1000,
+            'output_bytes': output_bytes,
+            'decodes_per_file': decodes / len(times),
+            'peak_rss_mb': peak_rss,
+        }
+    plain = results['plain']['seconds']
+    for mode in results:
+        results[mode]['overhead'] = results[mode]['seconds'] / plain - 1 if plain else None
+    return results
+
+def benchmark_animated(gif_paths, profile=DEFAULT_PROFILE):
+    """
+    Compara cada GIF con su WebP animado: tamaño, tiempo de codificación y memoria.
+
+    Returns:
+        list: Un diccionario de resultados por archivo
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for gif_path in gif_paths:
+            gif_path = pathlib.Path(gif_path)
+            output = pathlib.Path(tmp_dir) / (gif_path.stem + ".webp")
+            elapsed, peak_rss = run_isolated(_timed_conversion, gif_path, output, profile)
+
+            with Image.open(gif_path) as img:
+                frames = getattr(img, "n_frames", 1)
+            gif_bytes = gif_path.stat().st_size
+            webp_bytes = output.stat().st_size
+            results.append({
+                'file': str(gif_path),
+                'profile': profile,
+                'frames': frames,
+                'gif_bytes': gif_bytes,
+                'webp_bytes': webp_bytes,
+                'size_ratio': webp_bytes / gif_bytes,
+                'encode_seconds': elapsed,
+                'frames_per_second': frames / elapsed if elapsed else None,
+                'peak_rss_mb': peak_rss,
+            })
+    return results
+
+def _print_animated(results):
+    for r in results:
+        print(
+            f"{pathlib.Path(r['file']).name}: {r['frames']} fotogramas, "
+            f"GIF {r['gif_bytes'] / 1024:.0f} KB -> WebP {r['webp_bytes'] / 1024:.0f} KB "
+            f"({r['size_ratio']:.0%}), {r['encode_seconds']:.2f} s, "
+            f"pico RSS {r['peak_rss_mb'] or 0:.0f} MB"
+        )
+
+def _print_mmap(results):
+    for mode in ("buffered", "mmap"):
+        r = results[mode]
+        print(
+            f"{mode:>8}: {r['files']} archivos, {r['per_file_ms']:.1f} ms/archivo, "
+            f"{r['mb_per_second']:.0f} MB/s, pico RSS {r['peak_rss_mb'] or 0:.0f} MB"
+        )
+    print(f"Aceleración con mmap: x{results['speedup']:.2f}")
+
+def _print_metadata(results):
+    for mode, r in results.items():
+        print(
+            f"{mode:>14}: {r['per_file_ms']:.1f} ms/archivo ({r['overhead']:+.1%}), "
+            f"{r['decodes_per_file']:.0f} decodificación(es) por archivo, "
+            f"salida {r['output_bytes'] / 1024:.0f} KB, pico RSS {r['peak_rss_mb'] or 0:.0f} MB"
+        )
+
+def _print_suite(results):
+    for r in results['single']:
+        print(
+            f"archivo a archivo [{r['profile']}]: {r['files_per_second']:.1f} archivos/s, "
+            f"{r['mb_per_second']:.1f} MB/s, p50 {r['p50_ms']:.0f} ms, p95 {r['p95_ms']:.0f} ms, "
+            f"pico RSS {r['peak_rss_mb'] or 0:.0f} MB"
+        )
+        for kind, k in r['by_kind'].items():
+            print(f"    {kind:>8}: p50 {k['p50_ms']:.0f} ms, p95 {k['p95_ms']:.0f} ms")
+    for r in results['folder']:
+        print(
+            f"carpeta [{r['profile']}, {r['workers']} procesos]: {r['files_per_second']:.1f} archivos/s, "
+            f"{r['mb_per_second']:.1f} MB/s, p50 {r['p50_ms']:.0f} ms, p95 {r['p95_ms']:.0f} ms, "
+            f"pico RSS {r['peak_rss_mb'] or 0:.0f} MB (proceso del pool {r['peak_worker_rss_mb'] or 0:.0f} MB)"
+        )
+
+def _print_comparison(rows):
+    # En estas métricas un valor más alto es peor
+    lower_is_better = {'p50_ms', 'p95_ms', 'peak_rss_mb', 'peak_worker_rss_mb'}
+    for name, metric, before, after, change in rows:
+        worse = change > 0 if metric in lower_is_better else change < 0
+        flag = "  <-- peor" if worse and abs(change) >= 0.05 else ""
+        print(f"{name:<28} {metric:<17} {before:>10.1f} -> {after:>10.1f} ({change:+.1%}){flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del conversor WebP")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    animated = sub.add_parser("animated", help="GIF animado frente a WebP animado")
+    animated.add_argument("gifs", nargs="*", help="GIFs a medir (si no se indica, se genera uno)")
+    animated.add_argument("--frames", type=int, default=120, help="Fotogramas del GIF sintético")
+    animated.add_argument("--profile", choices=list(ENCODE_PROFILES), default=DEFAULT_PROFILE)
+    animated.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+
+    mapped = sub.add_parser("mmap", help="Lectura normal frente a lectura mapeada en memoria")
+    mapped.add_argument("images", nargs="*", help="Imágenes a medir (si no se indica, se generan)")
+    mapped.add_argument("--count", type=int, default=6, help="Imágenes sintéticas a generar")
+    mapped.add_argument("--repeat", type=int, default=3, help="Pasadas por modo (se toma la mejor)")
+    mapped.add_argument("--profile", choices=list(ENCODE_PROFILES), default="fast")
+    mapped.add_argument("--max-dimension", type=int, default=1024,
+                        help="Lado máximo de salida (0 para no reducir)")
+    mapped.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+
+    suite = sub.add_parser("suite", help="Benchmark completo sobre un corpus sintético")
+    suite.add_argument("--sizes", default="small,medium",
+                       help=f"Tamaños del corpus separados por comas ({', '.join(CORPUS_SIZES)})")
+    suite.add_argument("--count", type=int, default=2, help="Imágenes de cada tipo y tamaño")
+    suite.add_argument("--seed", type=int, default=CORPUS_SEED, help="Semilla del corpus")
+    suite.add_argument("--profiles", default=DEFAULT_PROFILE, help="Perfiles separados por comas")
+    suite.add_argument("--workers", default=f"1,{DEFAULT_WORKERS}",
+                       help="Números de procesos a medir, separados por comas")
+    suite.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+
+    compare = sub.add_parser("compare", help="Comparar dos resultados JSON de 'suite'")
+    compare.add_argument("before", help="Resultados de referencia")
+    compare.add_argument("after", help="Resultados nuevos")
+
+    meta = sub.add_parser("metadata", help="Coste de conservar metadatos y aplicar la orientación")
+    meta.add_argument("images", nargs="*", help="Fotos a medir (si no se indica, se generan)")
+    meta.add_argument("--count", type=int, default=6, help="Fotos sintéticas a generar")
+    meta.add_argument("--repeat", type=int, default=3, help="Pasadas por modo (se toma la mejor)")
+    meta.add_argument("--profile", choices=list(ENCODE_PROFILES), default=DEFAULT_PROFILE)
+    meta.add_argument("--max-dimension", type=int, default=2048,
+                      help="Lado máximo de salida (0 para no reducir)")
+    meta.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "animated":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            gifs = args.gifs or [
+                run_isolated(make_animated_gif, pathlib.Path(tmp_dir) / "sintetico.gif", args.frames)
+            ]
+            results = benchmark_animated(gifs, args.profile)
+        _print_animated(results)
+
+    if args.command == "mmap":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            images = args.images or run_isolated(make_still_images, tmp_dir, args.count)
+            results = benchmark_mmap(images, args.profile, args.repeat, args.max_dimension or None)
+        _print_mmap(results)
+
+    if args.command == "metadata":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            images = args.images or run_isolated(make_phone_photos, tmp_dir, args.count)
+            results = benchmark_metadata(images, args.profile, args.repeat, args.max_dimension or None)
+        _print_metadata(results)
+
+    if args.command == "suite":
+        sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+        unknown = [s for s in sizes if s not in CORPUS_SIZES]
+        if unknown:
+            parser.error(f"tamaños desconocidos: {', '.join(unknown)}")
+        profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+        unknown = [p for p in profiles if p not in ENCODE_PROFILES]
+        if unknown:
+            parser.error(f"perfiles desconocidos: {', '.join(unknown)}")
+        workers_list = sorted({int(w) for w in args.workers.split(",") if w.strip()})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = run_isolated(make_corpus, tmp_dir, sizes, args.count, args.seed)
+            results = {
+                'environment': environment_info(),
+                'corpus': {
+                    'seed': args.seed,
+                    'sizes': sizes,
+                    'count': args.count,
+                    'files': len(paths),
+                    'bytes': sum(os.path.getsize(p) for p in paths),
+                },
+            }
+            results.update(benchmark_suite(tmp_dir, profiles, workers_list))
+        _print_suite(results)
+
+    if args.command == "compare":
+        with open(args.before, encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.after, encoding="utf-8") as f:
+            after = json.load(f)
+        _print_comparison(compare_results(before, after))
+        return
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
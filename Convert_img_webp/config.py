@@ -0,0 +1,98 @@
+"""
+Configuración y constantes para el conversor de imágenes a WebP
+"""
+
+import os
+
+# Extensiones de imagen aceptadas como entrada
+VALID_EXTENSIONS = [".jpg", ".jpeg", ".png", ".bmp", ".gif"]
+
+# Número de procesos por defecto para la conversión en paralelo
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+def _physical_memory_mb():
+    """Memoria física del equipo en MB (None si el sistema no la informa)."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+# Presupuesto de memoria de la conversión en paralelo (MB): solo se lanzan imágenes
+# mientras la memoria prevista de las que están en curso quepa en él.
+# Por defecto, la mitad de la memoria física (4 GB si no se puede consultar)
+MEMORY_BUDGET_MB = (_physical_memory_mb() or 8192) // 2
+
+# Memoria base de cada proceso del pool (intérprete + Pillow), en MB
+WORKER_BASELINE_MB = 40
+
+# Qué hacer con las imágenes que por sí solas superan el presupuesto:
+#  - serial: convertirlas al final, de una en una, sin nada más en curso
+#  - reject: no convertirlas e informar el motivo
+OVERSIZE_POLICIES = ["serial", "reject"]
+DEFAULT_OVERSIZE_POLICY = "serial"
+
+# Hilos de E/S (lectura anticipada y escritura) del pipeline por etapas
+DEFAULT_IO_THREADS = 4
+
+# Sincronización con el disco (fsync) de las imágenes escritas:
+#  - none: ninguna; el renombrado atómico ya evita archivos a medias si el
+#    proceso muere, pero no ante un corte de corriente
+#  - file: cada archivo antes de renombrarlo (lo más seguro y lo más lento)
+#  - batch: por lotes de FSYNC_BATCH_SIZE salidas, y siempre antes de guardar
+#    el manifiesto
+FSYNC_POLICIES = ["none", "file", "batch"]
+DEFAULT_FSYNC_POLICY = "none"
+FSYNC_BATCH_SIZE = 50
+
+# Archivos temporales huérfanos (de una ejecución interrumpida) más antiguos que
+# esto se eliminan al empezar, si no se puede saber si su proceso sigue vivo
+TEMP_ORPHAN_AGE = 3600
+
+# Manifiesto del modo incremental (se guarda dentro de la carpeta de salida)
+MANIFEST_FILENAME = ".webp_manifest.json"
+MANIFEST_VERSION = 1
+
+# Punto de control de un trabajo en curso (también en la carpeta de salida) y
+# cada cuántas imágenes terminadas se guarda
+CHECKPOINT_FILENAME = ".webp_checkpoint.json"
+CHECKPOINT_VERSION = 2
+CHECKPOINT_INTERVAL = 50
+
+# Modo vigilancia: segundos que un archivo debe estar sin cambios antes de
+# convertirlo (para no leer subidas a medias) e intervalo entre recorridos de
+# la carpeta cuando no se puede usar inotify
+WATCH_DEBOUNCE = 2.0
+WATCH_POLL_INTERVAL = 1.0
+# Segundos entre escrituras del manifiesto mientras se vigila (y al salir)
+WATCH_MANIFEST_SAVE_INTERVAL = 5.0
+
+# Refresco de la barra de progreso de la interfaz (ms): ~10 veces por segundo
+PROGRESS_REFRESH_MS = 100
+
+# Perfiles de codificación WebP (parámetros de Pillow para img.save)
+#  - quality: calidad con pérdida (0-100); en modo sin pérdida es el esfuerzo
+#  - method: compromiso velocidad/tamaño (0 = más rápido, 6 = más pequeño)
+#  - alpha_quality: calidad del canal alfa (0-100)
+#  - exact: conserva los valores RGB de los píxeles totalmente transparentes
+ENCODE_PROFILES = {
+    "fast": {"quality": 75, "method": 0, "lossless": False, "alpha_quality": 80, "exact": False},
+    "balanced": {"quality": 80, "method": 4, "lossless": False, "alpha_quality": 100, "exact": False},
+    "smallest": {"quality": 70, "method": 6, "lossless": False, "alpha_quality": 70, "exact": False},
+    "lossless": {"quality": 80, "method": 4, "lossless": True, "alpha_quality": 100, "exact": True},
+}
+DEFAULT_PROFILE = "balanced"
+
+# Filtros de remuestreo disponibles al reducir imágenes con una dimensión máxima
+RESAMPLE_FILTERS = ["nearest", "bilinear", "bicubic", "lanczos"]
+DEFAULT_RESAMPLE = "lanczos"
+
+# Variantes responsivas: anchos sugeridos y nombre de cada archivo generado
+DEFAULT_VARIANT_WIDTHS = [320, 640, 1280, 2560]
+DEFAULT_VARIANT_PATTERN = "{stem}-{width}w.webp"
+
+# Enderezar las imágenes según su orientación EXIF (la misma opción por defecto
+# en la interfaz y en la línea de comandos)
+DEFAULT_AUTO_ORIENT = True
+
+# Caché de deduplicación por contenido (blobs WebP compartidos entre ejecuciones)
+DEDUP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".webp_converter_cache")
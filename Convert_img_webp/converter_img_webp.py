@@ -4,32 +4,1471 @@
 #Programa creado por: @GermanGonzalez
 #Fecha de creación: 2025-07-30
 
+import argparse
+import collections
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
+import os
 import pathlib
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
 
-def convert_image_to_webp(input_image_path, output_image_path):
-    """Convierte una imagen a formato WebP."""
-    with Image.open(input_image_path) as img:
-        img.save(output_image_path, "WEBP")
+from config import (
+    DEFAULT_WORKERS, DEFAULT_IO_THREADS, DEDUP_CACHE_DIR, ENCODE_PROFILES, DEFAULT_PROFILE,
+    RESAMPLE_FILTERS, DEFAULT_RESAMPLE, DEFAULT_VARIANT_WIDTHS, DEFAULT_VARIANT_PATTERN,
+    DEFAULT_AUTO_ORIENT, MEMORY_BUDGET_MB, WORKER_BASELINE_MB, OVERSIZE_POLICIES, DEFAULT_OVERSIZE_POLICY,
+    WATCH_DEBOUNCE, WATCH_POLL_INTERVAL, WATCH_MANIFEST_SAVE_INTERVAL, FSYNC_POLICIES, DEFAULT_FSYNC_POLICY, FSYNC_BATCH_SIZE,
+)
+from animation import is_animated, save_animated_webp
+from atomic_io import atomic_output, sweep_temp_files, sync_outputs
+from dedup_cache import DedupCache, cache_key
+from job_control import JobCheckpoint
+from manifest import ConversionManifest, file_digest
+from memory_budget import MB, estimate_memory
+from metadata import apply_orientation, exif_orientation, metadata_params, oriented_size
+from pipeline import StagedPipeline
+from source_io import open_source
+from verify import is_sampled, verify_webp
+from walker import iter_conversion_tasks, sibling_conversion_tasks
+from watcher import FolderWatcher
 
-def convert_folder_images_to_webp(input_folder, output_folder):
+def _profile_params(profile):
+    """Parámetros de Pillow de un perfil de codificación."""
+    try:
+        return ENCODE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Perfil de codificación desconocido: {profile}") from None
+
+def _resample_filter(resample):
+    """Filtro de remuestreo de Pillow a partir de su nombre."""
+    if resample not in RESAMPLE_FILTERS:
+        raise ValueError(f"Filtro de remuestreo desconocido: {resample}")
+    return getattr(Image.Resampling, resample.upper())
+
+def encode_settings(
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    variant_widths=None,
+    variant_pattern=DEFAULT_VARIANT_PATTERN,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+):
     """
-    Convierte todas las imágenes en una carpeta a formato WebP.
+    Ajustes de codificación de un perfil, tal como se guardan en el manifiesto
+    y en la clave de la caché de deduplicación.
+    """
+    if max_dimension and variant_widths:
+        raise ValueError("max_dimension y variant_widths no se pueden usar a la vez")
+
+    settings = {"format": "WEBP", "profile": profile, **_profile_params(profile)}
+    if max_dimension or variant_widths:
+        _resample_filter(resample)
+        settings["resample"] = resample
+    if max_dimension:
+        settings["max_dimension"] = max_dimension
+    if variant_widths:
+        settings["variant_widths"] = sorted(set(variant_widths))
+        settings["variant_pattern"] = variant_pattern
+    if keep_metadata:
+        settings["keep_metadata"] = True
+    if auto_orient:
+        settings["auto_orient"] = True
+    return settings
+
+def fit_size(size, max_dimension):
+    """
+    Tamaño reducido que cabe en `max_dimension` manteniendo la proporción,
+    o None si la imagen ya es lo bastante pequeña (nunca se amplía).
+    """
+    width, height = size
+    longest = max(width, height)
+    if not max_dimension or longest <= max_dimension:
+        return None
+    scale = max_dimension / longest
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def convert_image_to_webp(
+    input_image_path,
+    output_image_path,
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    use_mmap=False,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    fsync=False,
+):
+    """
+    Convierte una imagen a formato WebP con el perfil de codificación indicado.
+
+    Con `max_dimension` la imagen se reduce para que su lado mayor no la supere.
+    En los JPEG se usa `draft()` para que el decodificador entregue directamente
+    la imagen a 1/2, 1/4 u 1/8 de su tamaño, sin decodificarla a resolución completa.
+
+    Las imágenes animadas (GIF) se convierten en WebP animado a su tamaño original,
+    fotograma a fotograma; `max_dimension` no se aplica a ellas.
+
+    Con `use_mmap=True` el origen se lee mapeado en memoria (ver `source_io`).
+
+    Con `keep_metadata=True` se copian al WebP el EXIF, el XMP y el perfil ICC;
+    con `auto_orient=True` la imagen se endereza según su orientación EXIF. Ambos
+    salen de la cabecera ya leída, sin decodificar la imagen otra vez.
+
+    La salida se escribe de forma atómica (ver `atomic_io.atomic_output`); con
+    `fsync=True` se fuerza además a disco antes de renombrarla.
+    """
+    params = _profile_params(profile)
+    resample_filter = _resample_filter(resample)
+    with open_source(input_image_path, use_mmap) as source, Image.open(source) as img:
+        orientation = exif_orientation(img) if auto_orient else 1
+        params = dict(params, **metadata_params(img, keep_metadata, orientation != 1))
+        if is_animated(img):
+            with atomic_output(output_image_path, fsync) as tmp_path:
+                save_animated_webp(img, tmp_path, params, input_image_path)
+            return
+
+        frame = _prepare_still(img, max_dimension, resample_filter, orientation)
+        with atomic_output(output_image_path, fsync) as tmp_path:
+            frame.save(tmp_path, "WEBP", **params)
+
+def _for_resize(img):
+    """
+    Imagen lista para reducirse con el filtro elegido: en los modos 'P' y '1'
+    Pillow solo reduce con NEAREST (bordes dentados), así que antes se pasan a
+    RGB, o a RGBA si tienen transparencia.
+    """
+    if img.mode not in ("P", "1"):
+        return img
+    if img.mode == "P" and ("transparency" in img.info or img.palette.mode == "RGBA"):
+        return img.convert("RGBA")
+    return img.convert("RGB")
+
+def _prepare_still(img, max_dimension, resample_filter, orientation=1):
+    """
+    Decodifica una imagen fija, reducida si supera `max_dimension` y enderezada
+    según `orientation` (valor EXIF).
+
+    En los JPEG `draft()` elige la mayor reducción del decodificador que no baje
+    del tamaño final, de modo que no se decodifica a resolución completa. El giro
+    se aplica después de reducir, sobre menos píxeles.
+    """
+    target = fit_size(img.size, max_dimension)
+    if target is None:
+        img.load()
+        return apply_orientation(img, orientation)
+    img.draft(img.mode, target)
+    return apply_orientation(
+        _for_resize(img).resize(target, resample_filter, reducing_gap=3.0), orientation
+    )
+
+def plan_variants(size, variant_widths):
+    """
+    Tamaños de las variantes a generar para una imagen de tamaño `size`,
+    como lista de (ancho, (ancho, alto)) de mayor a menor.
+
+    Los anchos mayores que el original se omiten (nunca se amplía); si la imagen
+    es más estrecha que todos ellos se genera una única variante a su ancho real.
+    """
+    width, height = size
+    widths = [w for w in sorted(set(variant_widths), reverse=True) if w <= width]
+    if not widths:
+        return [(width, (width, height))]
+    return [(w, (w, max(1, round(height * w / width)))) for w in widths]
+
+def variant_path(output_image_path, width, pattern=DEFAULT_VARIANT_PATTERN):
+    """Ruta de una variante a partir de la ruta de salida base (`nombre.webp`)."""
+    base = pathlib.Path(output_image_path)
+    return base.with_name(pattern.format(stem=base.stem, width=width))
+
+def convert_image_to_webp_variants(
+    input_image_path,
+    output_image_path,
+    variant_widths=DEFAULT_VARIANT_WIDTHS,
+    variant_pattern=DEFAULT_VARIANT_PATTERN,
+    profile=DEFAULT_PROFILE,
+    resample=DEFAULT_RESAMPLE,
+    use_mmap=False,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    fsync=False,
+):
+    """
+    Genera varias anchuras WebP de una imagen decodificándola una sola vez.
+
+    La imagen se decodifica (con `draft()` en los JPEG) al tamaño de la variante
+    más grande, y cada variante se obtiene reduciendo la anterior, que es mucho
+    más barato que partir siempre del original. Con `auto_orient` los anchos se
+    refieren a la imagen ya enderezada.
+
+    Returns:
+        dict: {ancho: ruta} de las variantes escritas
+    """
+    params = _profile_params(profile)
+    resample_filter = _resample_filter(resample)
+    outputs = {}
+    with open_source(input_image_path, use_mmap) as source, Image.open(source) as img:
+        orientation = exif_orientation(img) if auto_orient else 1
+        params = dict(params, **metadata_params(img, keep_metadata, orientation != 1))
+        plan = plan_variants(oriented_size(img.size, orientation), variant_widths)
+        # El decodificador trabaja en la orientación original de la imagen
+        largest = oriented_size(plan[0][1], orientation)
+        img.draft(img.mode, largest)
+
+        current = None
+        for width, size in plan:
+            if current is None:
+                current = img
+                if img.size != largest:
+                    current = _for_resize(img).resize(largest, resample_filter, reducing_gap=3.0)
+                current = apply_orientation(current, orientation)
+            elif current.size != size:
+                current = _for_resize(current).resize(size, resample_filter, reducing_gap=3.0)
+            path = variant_path(output_image_path, width, variant_pattern)
+            with atomic_output(path, fsync) as tmp_path:
+                current.save(tmp_path, "WEBP", **params)
+            outputs[width] = path
+    return outputs
+
+def _new_result(input_image_path, output_image_path, status):
+    """Registro de resultado por archivo, común a todas las vías de conversión."""
+    return {
+        'source': input_image_path,
+        'output': output_image_path,
+        'status': status,
+        'bytes_in': 0,
+        'bytes_out': 0,
+        'encode_time': 0.0,
+        'error': None,
+        'cache_hit': None,
+        'sha256': None,
+        'variants': None,
+        'stage_times': None,
+        'verified': None,
+        'larger_than_source': False,
+    }
+
+def _convert_task(
+    input_image_path,
+    output_image_path,
+    cache_dir=None,
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    variant_widths=None,
+    variant_pattern=DEFAULT_VARIANT_PATTERN,
+    use_mmap=False,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    verify_sample=0.0,
+    fsync=False,
+    digest=False,
+):
     """
-    input_path = pathlib.Path(input_folder)
+    Tarea ejecutada dentro de un proceso del pool.
+
+    Devuelve el registro de resultado (ver `_new_result`) en lugar de lanzar la
+    excepción, para que un archivo dañado no detenga el resto de la conversión.
+    Con `cache_dir` se consulta primero la caché de deduplicación; con
+    `variant_widths` se generan varias anchuras y `output_image_path` es la base
+    de la que se derivan sus nombres (las animaciones se escriben como una sola
+    salida a tamaño original).
+
+    Si el origen entra en la muestra `verify_sample` (0 a 1, ver
+    `verify.is_sampled`), las salidas se decodifican y se comparan con las
+    dimensiones esperadas en el mismo proceso, antes de guardarlas en la caché;
+    si algo falla el resultado es 'failed' y las salidas se eliminan.
+    `larger_than_source` indica si la salida (la mayor, con variantes) ocupa
+    más que el original.
+
+    El SHA-256 del origen se calcula aquí, en paralelo, con `cache_dir` o con
+    `digest=True` (modo incremental), y viaja en `sha256` para que el
+    manifiesto no tenga que volver a leer el archivo.
+    """
+    result = _new_result(input_image_path, output_image_path, 'converted')
+    start = time.perf_counter()
+    try:
+        result['bytes_in'] = os.path.getsize(input_image_path)
+        settings = encode_settings(
+            profile, max_dimension, resample, variant_widths, variant_pattern,
+            keep_metadata, auto_orient,
+        )
+
+        verify = is_sampled(input_image_path, verify_sample)
+        outputs = {None: output_image_path}
+        expected = {}
+        if variant_widths or verify:
+            # Solo se lee la cabecera para conocer el tamaño; no se decodifica
+            with Image.open(input_image_path) as img:
+                if is_animated(img):
+                    variant_widths = None
+                    expected = {None: (img.size, img.n_frames)}
+                else:
+                    orientation = exif_orientation(img) if auto_orient else 1
+                    size = oriented_size(img.size, orientation)
+                    if variant_widths:
+                        plan = plan_variants(size, variant_widths)
+                        outputs = {
+                            width: variant_path(output_image_path, width, variant_pattern)
+                            for width, _ in plan
+                        }
+                        expected = {width: (variant_size, 1) for width, variant_size in plan}
+                    else:
+                        expected = {None: (fit_size(size, max_dimension) or size, 1)}
+
+        def verify_outputs():
+            problems = [
+                problem
+                for width, path in outputs.items()
+                for problem in verify_webp(path, *expected[width])
+            ]
+            result['verified'] = not problems
+            if problems:
+                # Una salida defectuosa no debe quedar en disco: la próxima
+                # ejecución incremental la daría por buena
+                for path in outputs.values():
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+                raise ValueError("verificación fallida: " + "; ".join(problems))
+
+        if cache_dir or digest:
+            result['sha256'] = file_digest(input_image_path)
+
+        cache = None
+        if cache_dir:
+            cache = DedupCache(cache_dir)
+            keys = {
+                width: cache_key(result['sha256'], dict(settings, variant=width))
+                for width in outputs
+            }
+            result['cache_hit'] = all(cache.contains(key) for key in keys.values())
+
+        if result['cache_hit']:
+            for width, path in outputs.items():
+                cache.materialize(keys[width], path, fsync)
+            result['status'] = 'cached'
+            if verify:
+                verify_outputs()
+        else:
+            if variant_widths:
+                convert_image_to_webp_variants(
+                    input_image_path, output_image_path, variant_widths, variant_pattern,
+                    profile, resample, use_mmap, keep_metadata, auto_orient, fsync,
+                )
+            else:
+                convert_image_to_webp(
+                    input_image_path, output_image_path, profile, max_dimension, resample,
+                    use_mmap, keep_metadata, auto_orient, fsync,
+                )
+            if verify:
+                verify_outputs()
+            if cache:
+                for width, path in outputs.items():
+                    cache.store(keys[width], path)
+
+        if variant_widths:
+            result['variants'] = outputs
+        sizes = [os.path.getsize(path) for path in outputs.values()]
+        result['bytes_out'] = sum(sizes)
+        result['larger_than_source'] = max(sizes) > result['bytes_in']
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    result['encode_time'] = time.perf_counter() - start
+    return result
+
+def _memory_target(max_dimension=None, variant_widths=None, **_options):
+    """Función tamaño -> tamaño reducido para `memory_budget.estimate_memory`."""
+    if variant_widths:
+        return lambda size: plan_variants(size, variant_widths)[0][1]
+    if max_dimension:
+        return lambda size: fit_size(size, max_dimension)
+    return None
+
+def _task_budget(workers, memory_budget, oversize, options):
+    """
+    Presupuesto en bytes para las tareas en curso (None si no se limita) y
+    función `estimate(entrada, salida) -> (memoria, registro)`.
+
+    `registro` es None si la imagen puede enviarse al pool; si no, es el
+    resultado que se entrega sin convertirla: 'rejected' si supera el límite de
+    píxeles de Pillow o, con `oversize='reject'`, el presupuesto, y 'failed' si
+    su cabecera no se puede leer.
+    """
+    budget = target_size = None
+    if memory_budget:
+        budget = (memory_budget - workers * WORKER_BASELINE_MB) * MB
+        if budget <= 0:
+            raise ValueError(
+                f"El presupuesto de memoria ({memory_budget} MB) no cubre la memoria base de "
+                f"{workers} procesos ({workers * WORKER_BASELINE_MB} MB)"
+            )
+        target_size = _memory_target(**options)
+
+    def estimate(input_image_path, output_image_path):
+        try:
+            needed = estimate_memory(input_image_path, target_size)
+        except Image.DecompressionBombError as e:
+            # Pillow se negaría a decodificarla: no tiene sentido enviarla al pool
+            return 0, _rejected_result(input_image_path, output_image_path, str(e))
+        except Exception as e:
+            result = _new_result(input_image_path, output_image_path, 'failed')
+            result['error'] = f"no se pudo leer la cabecera: {e}"
+            return 0, result
+        if needed > budget and oversize == 'reject':
+            return needed, _rejected_result(
+                input_image_path, output_image_path,
+                f"necesitaría unos {needed / MB:.0f} MB de memoria y el presupuesto "
+                f"disponible es de {budget / MB:.0f} MB",
+            )
+        return needed, None
+
+    return budget, estimate
+
+def _rejected_result(input_image_path, output_image_path, reason):
+    result = _new_result(input_image_path, output_image_path, 'rejected')
+    result['bytes_in'] = os.path.getsize(input_image_path)
+    result['error'] = reason
+    return result
+
+def _crashed_result(input_image_path, output_image_path, error):
+    """Registro 'failed' de una tarea cuyo proceso del pool murió (falta de memoria, fallo de Pillow...)."""
+    result = _new_result(input_image_path, output_image_path, 'failed')
+    result['error'] = f"el proceso de conversión terminó de forma inesperada: {error}"
+    return result
+
+def convert_images_parallel(
+    tasks,
+    workers=None,
+    memory_budget=None,
+    oversize=DEFAULT_OVERSIZE_POLICY,
+    controller=None,
+    **options
+):
+    """
+    Convierte en paralelo una secuencia de pares (entrada, salida).
+    `options` se pasa tal cual a `_convert_task` (cache_dir, profile, max_dimension...).
+
+    Es un generador: el resultado de cada archivo se entrega en cuanto termina,
+    sin esperar al resto. Solo se mantienen en vuelo unas pocas tareas por
+    proceso, por lo que `tasks` puede ser un iterador perezoso.
+
+    Con `memory_budget` (MB) se lee la cabecera de cada imagen para estimar la
+    memoria que necesitará (ver `memory_budget.estimate_memory`), y solo se
+    lanzan tareas mientras la suma de las que están en curso, más la memoria
+    base de cada proceso, quepa en el presupuesto. Las imágenes que no caben ni
+    solas se convierten al final de una en una (`oversize='serial'`) o se
+    entregan con estado 'rejected' y el motivo en `error` (`oversize='reject'`).
+    Las que superan el límite de píxeles de Pillow (`Image.MAX_IMAGE_PIXELS`)
+    se rechazan siempre, sin enviarlas al pool.
+
+    Si un proceso del pool muere (falta de memoria, un fallo de Pillow con un
+    archivo dañado), el pool se reemplaza y la conversión continúa; las tareas
+    que estaban en curso se repiten al final de una en una, y la que vuelve a
+    tumbar su proceso se entrega como 'failed'.
+
+    Con `controller` (ver `job_control.JobController`) la cancelación descarta
+    las tareas enviadas que aún no empezaron y el carril en serie se detiene
+    (o espera, si el trabajo está en pausa) antes de cada imagen. Las tareas
+    descartadas no producen registro.
+    """
+    workers = workers or DEFAULT_WORKERS
+    if oversize not in OVERSIZE_POLICIES:
+        raise ValueError(f"Política no válida: {oversize}. Opciones: {', '.join(OVERSIZE_POLICIES)}")
+
+    budget, estimate = _task_budget(workers, memory_budget, oversize, options)
+
+    # Con un solo proceso no compensa el coste de arrancar el pool
+    if workers == 1:
+        for input_image_path, output_image_path in tasks:
+            if budget is not None:
+                _, result = estimate(input_image_path, output_image_path)
+                if result is not None:
+                    yield result
+                    continue
+            yield _convert_task(input_image_path, output_image_path, **options)
+        return
+
+    max_pending = workers * 4
+    oversized = []
+    # Tareas en curso cuando murió un proceso del pool; cualquiera pudo ser la culpable
+    suspects = []
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+    pending = {}
+    in_use = 0
+
+    def wait_some():
+        nonlocal executor, in_use
+        if controller and controller.cancelled:
+            # Las que ya están en marcha terminan; las que esperan turno se descartan
+            for future in pending:
+                future.cancel()
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        if any(
+            not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+            for future in done
+        ):
+            # El pool ya no sirve y todas sus tareas terminan enseguida: se
+            # recogen juntas y las que quedan siguen en un pool nuevo
+            done, _ = wait(pending)
+            executor.shutdown(wait=False)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+        results = []
+        for future in done:
+            task, needed = pending.pop(future)
+            in_use -= needed
+            if future.cancelled():
+                continue
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                suspects.append(task)
+            except Exception as e:
+                results.append(_crashed_result(*task, e))
+        return results
+
+    try:
+        for input_image_path, output_image_path in tasks:
+            needed = 0
+            if budget is not None:
+                needed, result = estimate(input_image_path, output_image_path)
+                if result is not None:
+                    yield result
+                    continue
+                if needed > budget:
+                    oversized.append((input_image_path, output_image_path))
+                    continue
+
+            while pending and (
+                len(pending) >= max_pending or (budget is not None and in_use + needed > budget)
+            ):
+                yield from wait_some()
+            future = executor.submit(_convert_task, input_image_path, output_image_path, **options)
+            pending[future] = ((input_image_path, output_image_path), needed)
+            in_use += needed
+
+        while pending:
+            yield from wait_some()
+
+        # Carril en serie: cada imagen enorme se convierte sin nada más en curso, y
+        # las tareas afectadas por la caída de un proceso se repiten de una en una
+        # para que solo falle la que lo provoca
+        for task in oversized + suspects:
+            if controller and not controller.wait_if_paused():
+                break
+            future = executor.submit(_convert_task, *task, **options)
+            try:
+                yield future.result()
+            except Exception as e:
+                yield _crashed_result(*task, e)
+                if isinstance(e, BrokenProcessPool):
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def _read_source(task):
+    """Etapa de lectura del pipeline: contenido completo del archivo de origen."""
+    with open(task[0], "rb") as f:
+        return f.read()
+
+def _encode_bytes(
+    data,
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    digest=False,
+):
+    """
+    Etapa de CPU del pipeline: decodifica y codifica en memoria.
+
+    Returns:
+        tuple: (bytes WebP, segundos de decodificación, segundos de codificación,
+                SHA-256 de `data` si `digest` es True o None)
+    """
+    # El origen ya está en memoria: el hash del manifiesto sale de aquí sin releerlo
+    sha256 = hashlib.sha256(data).hexdigest() if digest else None
+    params = _profile_params(profile)
+    resample_filter = _resample_filter(resample)
+    output = io.BytesIO()
+    start = time.perf_counter()
+    with Image.open(io.BytesIO(data)) as img:
+        orientation = exif_orientation(img) if auto_orient else 1
+        params = dict(params, **metadata_params(img, keep_metadata, orientation != 1))
+        if is_animated(img):
+            # En las animaciones decodificación y codificación van intercaladas
+            save_animated_webp(img, output, params, data)
+            return output.getvalue(), 0.0, time.perf_counter() - start, sha256
+
+        frame = _prepare_still(img, max_dimension, resample_filter, orientation)
+        decoded = time.perf_counter()
+        frame.save(output, "WEBP", **params)
+    return output.getvalue(), decoded - start, time.perf_counter() - decoded, sha256
+
+def _write_output(task, value, fsync=False):
+    """Etapa de escritura del pipeline (atómica, ver `atomic_io`)."""
+    with atomic_output(task[1], fsync) as tmp_path, open(tmp_path, "wb") as f:
+        f.write(value[0])
+
+def convert_images_staged(
+    tasks,
+    workers=None,
+    io_threads=DEFAULT_IO_THREADS,
+    queue_depth=None,
+    pipeline_stats=None,
+    fsync=False,
+    **options
+):
+    """
+    Variante de `convert_images_parallel` que separa lectura, CPU y escritura en
+    etapas con colas acotadas (ver `pipeline.StagedPipeline`). Útil cuando las
+    imágenes están en un disco lento o de red: mientras unos archivos se leen o
+    escriben, la CPU sigue codificando otros.
+
+    `options` admite profile, max_dimension, resample, keep_metadata,
+    auto_orient y digest (ver `_encode_bytes`). Cada registro incluye
+    `stage_times` (read, decode, encode, write). Al terminar, si se pasa un
+    diccionario en `pipeline_stats`, se rellena con el resumen de las etapas.
+    Con `fsync=True` cada salida se fuerza a disco en la etapa de escritura.
+    """
+    staged = StagedPipeline(
+        _read_source,
+        _encode_bytes,
+        functools.partial(_write_output, fsync=fsync),
+        workers or DEFAULT_WORKERS,
+        io_threads,
+        queue_depth,
+        options,
+    )
+    for item in staged.run(tasks):
+        input_image_path, output_image_path = item['task']
+        result = _new_result(input_image_path, output_image_path, 'converted')
+        result['bytes_in'] = item['data_size']
+        times = item['times']
+        if item['error'] is None:
+            webp_data, decode_time, encode_time, result['sha256'] = item['value']
+            result['bytes_out'] = len(webp_data)
+            result['encode_time'] = decode_time + encode_time
+            times = dict(times, decode=decode_time, encode=encode_time)
+        else:
+            result['status'] = 'failed'
+            result['error'] = item['error']
+        times.pop('process', None)
+        result['stage_times'] = times
+        yield result
+
+    if pipeline_stats is not None:
+        pipeline_stats.update(staged.summary())
+
+def _sweep_orphans(output_path, cache_dir=None):
+    """Elimina los temporales huérfanos de la salida (y de la caché) antes de empezar."""
+    removed = sweep_temp_files(output_path)
+    if cache_dir and os.path.isdir(cache_dir):
+        removed += sweep_temp_files(cache_dir)
+    if removed:
+        print(f"Eliminados {len(removed)} archivos temporales de una ejecución interrumpida")
+
+def iter_convert_folder(
+    input_folder,
+    output_folder,
+    workers=None,
+    recursive=False,
+    incremental=False,
+    prune_stale=False,
+    cache_dir=None,
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    variant_widths=None,
+    variant_pattern=DEFAULT_VARIANT_PATTERN,
+    dry_run=False,
+    staged=False,
+    io_threads=DEFAULT_IO_THREADS,
+    queue_depth=None,
+    pipeline_stats=None,
+    use_mmap=False,
+    memory_budget=MEMORY_BUDGET_MB,
+    oversize=DEFAULT_OVERSIZE_POLICY,
+    controller=None,
+    checkpoint=False,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    verify_sample=0.0,
+    fsync_policy=DEFAULT_FSYNC_POLICY,
+):
+    """
+    Convierte las imágenes de una carpeta a WebP entregando un registro por archivo.
+
+    Es un generador: cada registro se entrega en cuanto termina su archivo. Los
+    registros son diccionarios con las claves source, output, status, bytes_in,
+    bytes_out, encode_time, error, cache_hit, sha256 y variants, más `done` y `total`
+    para poder mostrar el progreso. La carpeta se recorre mientras se convierte, así
+    que `total` es el número de imágenes encontradas hasta ese momento y solo es
+    definitivo al terminar el recorrido. `status` es uno de 'converted', 'cached', 'failed',
+    'rejected' (supera el presupuesto de memoria o el límite de píxeles de Pillow), 'skipped' (sin cambios, modo incremental), 'planned' (se convertiría; solo con
+    `dry_run=True`, que no escribe nada en disco) o 'stale' (salida cuyo origen ya
+    no existe; si `prune_stale` es True, la salida ya fue eliminada).
+
+    Con `recursive=True` se incluyen las subcarpetas y su estructura se replica en
+    la carpeta de salida (ver `walker.iter_conversion_tasks`).
+
+    Con `incremental=True` se usa el manifiesto de la carpeta de salida para omitir
+    las imágenes que no cambiaron desde la última ejecución. Con `cache_dir` las
+    imágenes duplicadas se toman de la caché de deduplicación. `profile` es el
+    nombre de uno de los perfiles de `config.ENCODE_PROFILES`; con `max_dimension`
+    las imágenes más grandes se reducen usando el filtro `resample`. Con
+    `variant_widths` cada imagen se genera en varias anchuras, nombradas según
+    `variant_pattern` (por ejemplo `foto-640w.webp`). `keep_metadata` y
+    `auto_orient` conservan EXIF/XMP/ICC y aplican la orientación EXIF (ver
+    `convert_image_to_webp`). Con `verify_sample` (0 a 1) esa fracción de las
+    salidas se decodifica y comprueba en el mismo proceso que las convirtió (ver
+    `_convert_task`). `fsync_policy` ('none', 'file' o 'batch', ver
+    `config.FSYNC_POLICIES`) decide cuándo se fuerzan a disco las salidas, que
+    siempre se escriben de forma atómica; al empezar se eliminan los temporales
+    huérfanos de ejecuciones interrumpidas. Con `use_mmap=True` los
+    orígenes se leen mapeados en memoria (salvo en el modo por etapas, que ya
+    lee cada archivo completo en la etapa de E/S).
+
+    `memory_budget` (MB, None para no limitar) y `oversize` controlan cuántas
+    imágenes se convierten a la vez según la memoria que necesitarán (ver
+    `convert_images_parallel`). No se aplican al modo por etapas.
+
+    Con `staged=True` se usa el pipeline por etapas (`convert_images_staged`) con
+    `io_threads` hilos de E/S y colas de `queue_depth` elementos; su resumen se
+    guarda en `pipeline_stats` si se pasa un diccionario. No admite variantes,
+    caché de deduplicación ni verificación.
+    """
+    if fsync_policy not in FSYNC_POLICIES:
+        raise ValueError(f"Política de fsync no válida: {fsync_policy}. Opciones: {', '.join(FSYNC_POLICIES)}")
+    if staged and (cache_dir or variant_widths or verify_sample):
+        raise ValueError("El pipeline por etapas no admite variantes, caché de deduplicación ni verificación")
+
+    settings = encode_settings(
+        profile, max_dimension, resample, variant_widths, variant_pattern,
+        keep_metadata, auto_orient,
+    )
+    options = {
+        'cache_dir': cache_dir,
+        'profile': profile,
+        'max_dimension': max_dimension,
+        'resample': resample,
+        'variant_widths': variant_widths,
+        'variant_pattern': variant_pattern,
+        'use_mmap': use_mmap,
+        'keep_metadata': keep_metadata,
+        'auto_orient': auto_orient,
+        'verify_sample': verify_sample,
+        'fsync': fsync_policy == 'file',
+        'digest': incremental,
+    }
     output_path = pathlib.Path(output_folder)
+    if not dry_run:
+        output_path.mkdir(parents=True, exist_ok=True)
+        _sweep_orphans(output_path, cache_dir)
 
-    if not output_path.exists():
-        output_path.mkdir(parents=True)
+    manifest = ConversionManifest(output_path) if incremental else None
+    job = None
+    if checkpoint:
+        job = JobCheckpoint(output_path)
+        job.load(input_folder, settings)
+    skipped = collections.deque()
+    walk = {'total': 0}
+    created_dirs = {output_path}
 
-    for image_file in input_path.glob("*"):
-        if image_file.suffix.lower() in [".jpg", ".jpeg", ".png", ".bmp", ".gif"]:
-            output_file = output_path / (image_file.stem + ".webp")
-            convert_image_to_webp(image_file, output_file)
+    def pending_tasks():
+        # Se consume a medida que el pool tiene hueco: la conversión empieza
+        # mientras el recorrido de la carpeta sigue en marcha
+        for image_file, output_file in iter_conversion_tasks(input_folder, output_path, recursive):
+            if controller and not controller.wait_if_paused():
+                return
+            walk['total'] += 1
+            if job and job.is_done(image_file):
+                outputs = job.outputs_for(image_file)
+                if all(os.path.exists(o) for o in outputs):
+                    result = _new_result(image_file, output_file, 'skipped')
+                    result['bytes_in'] = os.path.getsize(image_file)
+                    result['bytes_out'] = sum(os.path.getsize(o) for o in outputs)
+                    skipped.append(result)
+                    continue
+            if manifest and manifest.is_up_to_date(image_file, output_file, settings):
+                result = _new_result(image_file, output_file, 'skipped')
+                result['bytes_in'] = os.path.getsize(image_file)
+                result['bytes_out'] = sum(
+                    os.path.getsize(o) for o in manifest.outputs_for(image_file)
+                )
+                skipped.append(result)
+                continue
+            if not dry_run and output_file.parent not in created_dirs:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(output_file.parent)
+            yield image_file, output_file
 
-if __name__ == "__main__":
-    input_folder_Main = input("Ingrese la ruta de la carpeta de imágenes a convertir: ")
-    output_folder_Main = input("Ingrese la Ruta para las imagenes convertidas: ")
+    if dry_run:
+        results = (
+            _new_result(image_file, output_file, 'planned')
+            for image_file, output_file in pending_tasks()
+        )
+    elif staged:
+        results = convert_images_staged(
+            pending_tasks(),
+            workers,
+            io_threads,
+            queue_depth,
+            pipeline_stats,
+            profile=profile,
+            max_dimension=max_dimension,
+            resample=resample,
+            keep_metadata=keep_metadata,
+            auto_orient=auto_orient,
+            fsync=fsync_policy == 'file',
+            digest=incremental,
+        )
+    else:
+        results = convert_images_parallel(
+            pending_tasks(), workers, memory_budget, oversize, controller, **options
+        )
+
+    done = 0
+    finished = False
+    to_sync = []
+    try:
+        for result in results:
+            while skipped:
+                done += 1
+                yield dict(skipped.popleft(), done=done, total=walk['total'])
+            if fsync_policy == 'batch' and result['status'] in ('converted', 'cached'):
+                to_sync.extend(result['variants'].values() if result['variants'] else [result['output']])
+                if len(to_sync) >= FSYNC_BATCH_SIZE:
+                    sync_outputs(to_sync)
+                    to_sync.clear()
+            if manifest and result['status'] in ('converted', 'cached'):
+                manifest.record(
+                    result['source'], result['output'], settings, result['sha256'],
+                    list(result['variants'].values()) if result['variants'] else None,
+                )
+            if job and not dry_run and result['status'] in ('converted', 'cached'):
+                job.mark_done(
+                    result['source'],
+                    result['variants'].values() if result['variants'] else [result['output']],
+                )
+            done += 1
+            yield dict(result, done=done, total=walk['total'])
+
+        while skipped:
+            done += 1
+            yield dict(skipped.popleft(), done=done, total=walk['total'])
+        finished = not (controller and controller.cancelled)
+
+        if manifest and finished:
+            if prune_stale and not dry_run:
+                stale = manifest.prune_stale()
+            else:
+                stale = [o for _, outputs in manifest.find_stale() for o in outputs]
+            for output_file in stale:
+                yield dict(_new_result(None, output_file, 'stale'), done=done, total=walk['total'])
+    finally:
+        # Lo que el manifiesto da por hecho debe estar ya en disco
+        if to_sync:
+            sync_outputs(to_sync)
+        # Guardar aunque la ejecución se interrumpa, para no repetir lo ya convertido
+        if manifest and not dry_run:
+            manifest.save()
+        if job and not dry_run:
+            if finished:
+                job.clear()
+            else:
+                job.save()
+
+def _ignore_sigint():
+    """
+    Inicializador de los procesos del pool: Ctrl+C lo atiende solo el proceso
+    principal, que cierra el pool de forma ordenada (sin una traza por proceso).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _warm_up():
+    """Carga los complementos de Pillow en un proceso del pool."""
+    Image.init()
+
+def watch_folder(
+    input_folder,
+    output_folder,
+    workers=None,
+    recursive=False,
+    debounce=WATCH_DEBOUNCE,
+    poll_interval=WATCH_POLL_INTERVAL,
+    use_inotify=True,
+    controller=None,
+    cache_dir=None,
+    profile=DEFAULT_PROFILE,
+    max_dimension=None,
+    resample=DEFAULT_RESAMPLE,
+    variant_widths=None,
+    variant_pattern=DEFAULT_VARIANT_PATTERN,
+    use_mmap=False,
+    keep_metadata=False,
+    auto_orient=DEFAULT_AUTO_ORIENT,
+    verify_sample=0.0,
+    fsync_policy=DEFAULT_FSYNC_POLICY,
+    memory_budget=MEMORY_BUDGET_MB,
+    oversize=DEFAULT_OVERSIZE_POLICY,
+):
+    """
+    Vigila una carpeta y convierte a WebP cada imagen nueva o modificada.
+
+    Primero pone al día la carpeta (conversión incremental, igual que
+    `iter_convert_folder` con `incremental=True`); después queda a la espera
+    (ver `watcher.FolderWatcher`) y envía cada archivo, cuando lleva `debounce`
+    segundos sin cambiar, a un pool de procesos que se mantiene en marcha todo
+    el tiempo. Las conversiones se anotan en el manifiesto (que se guarda cada
+    WATCH_MANIFEST_SAVE_INTERVAL segundos y al salir), de modo que al relanzar
+    la vigilancia no se repite nada.
+
+    Los archivos listos esperan en una cola y pasan al pool con los mismos
+    límites que `convert_images_parallel`: unas pocas tareas por proceso y el
+    presupuesto de memoria `memory_budget`. Como la vigilancia no tiene un
+    final, con `oversize='serial'` las imágenes que no caben se convierten en
+    cuanto no queda nada más en curso.
+
+    Es un generador de registros como los de `iter_convert_folder` que no
+    termina hasta que se cancela con `controller` (o se cierra el generador).
+    El resto de opciones son las de `iter_convert_folder`.
+    """
+    task_options = {
+        'cache_dir': cache_dir,
+        'profile': profile,
+        'max_dimension': max_dimension,
+        'resample': resample,
+        'variant_widths': variant_widths,
+        'variant_pattern': variant_pattern,
+        'use_mmap': use_mmap,
+        'keep_metadata': keep_metadata,
+        'auto_orient': auto_orient,
+        'verify_sample': verify_sample,
+        'fsync': fsync_policy == 'file',
+        'digest': True,
+    }
+    settings = encode_settings(
+        profile, max_dimension, resample, variant_widths, variant_pattern,
+        keep_metadata, auto_orient,
+    )
+    workers = workers or DEFAULT_WORKERS
+    output_path = pathlib.Path(output_folder)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # La vigilancia empieza antes de la puesta al día para no perder lo que
+    # llegue mientras tanto
+    watcher = FolderWatcher(input_folder, recursive, debounce, poll_interval, output_path, use_inotify)
+    manifest = executor = None
+    try:
+        done = 0
+        for result in iter_convert_folder(
+            input_folder, output_path, workers, recursive, incremental=True,
+            memory_budget=memory_budget, oversize=oversize,
+            controller=controller, fsync_policy=fsync_policy,
+            **{k: v for k, v in task_options.items() if k not in ('fsync', 'digest')}
+        ):
+            done = result['done']
+            yield result
+        if controller and controller.cancelled:
+            return
 
-    convert_folder_images_to_webp(input_folder_Main, output_folder_Main)
-    print(f"Imágenes convertidas y guardadas en {output_folder_Main}")
+        manifest = ConversionManifest(output_path)
+        budget, estimate = _task_budget(workers, memory_budget, oversize, task_options)
+        max_pending = workers * 4
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+        # Arrancar los procesos ya, para que la primera subida no espere por ellos
+        for _ in range(workers):
+            executor.submit(_warm_up)
+
+        # Tareas a la espera, en orden de llegada:
+        #   origen -> (salida, memoria estimada, va sola, ya tumbó un proceso)
+        queued = {}
+        # Tareas en el pool: future -> (origen, salida, memoria, sola, sospechosa)
+        in_flight = {}
+        deferred = set()
+        in_use = 0
+        last_save = time.monotonic()
+
+        def report(result):
+            nonlocal done
+            done += 1
+            return dict(result, done=done, total=done + len(in_flight) + len(queued))
+
+        def submit_queued():
+            # Misma contrapresión que `convert_images_parallel`: pocas tareas por
+            # proceso y, con presupuesto, solo las que caben en la memoria libre
+            nonlocal in_use
+            while queued:
+                source = next(iter(queued))
+                output, needed, alone, suspect = queued[source]
+                if in_flight and (
+                    alone
+                    or len(in_flight) >= max_pending
+                    or any(task[3] for task in in_flight.values())
+                    or (budget is not None and in_use + needed > budget)
+                ):
+                    return
+                del queued[source]
+                future = executor.submit(_convert_task, source, output, **task_options)
+                in_flight[future] = (source, output, needed, alone, suspect)
+                in_use += needed
+
+        def finished_results(timeout=0):
+            nonlocal executor, in_use
+            if not in_flight:
+                return
+            finished, _ = wait(in_flight, timeout=timeout)
+            if any(
+                not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+                for future in finished
+            ):
+                # Como en `convert_images_parallel`: se recogen todas las tareas del
+                # pool roto y las que estaban en curso se repiten de una en una
+                finished, _ = wait(in_flight)
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+            to_sync = []
+            suspects = {}
+            for future in finished:
+                source, output, needed, alone, suspect = in_flight.pop(future)
+                in_use -= needed
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    if not suspect:
+                        suspects[source] = (output, needed, True, True)
+                        continue
+                    result = _crashed_result(source, output, e)
+                except Exception as e:
+                    result = _crashed_result(source, output, e)
+                if result['status'] in ('converted', 'cached'):
+                    to_sync.extend(
+                        result['variants'].values() if result['variants'] else [result['output']]
+                    )
+                    manifest.record(
+                        result['source'], result['output'], settings, result['sha256'],
+                        list(result['variants'].values()) if result['variants'] else None,
+                    )
+                yield report(result)
+            if suspects:
+                # Las sospechosas pasan delante de lo que ya esperaba
+                waiting = dict(queued)
+                queued.clear()
+                queued.update(suspects)
+                queued.update(waiting)
+            if to_sync and fsync_policy == 'batch':
+                sync_outputs(to_sync)
+
+        while controller is None or controller.wait_if_paused():
+            ready = watcher.wait_ready(timeout=0.2 if in_flight else 1.0)
+            busy = {task[0] for task in in_flight.values()} | queued.keys()
+            # Un archivo que cambió mientras se convertía se reintenta al terminar
+            retry = [p for p in deferred if p not in busy]
+            deferred.difference_update(retry)
+
+            for source, output in sibling_conversion_tasks(ready + retry, input_folder, output_path):
+                if source in busy:
+                    deferred.add(source)
+                    continue
+                if manifest.is_up_to_date(source, output, settings):
+                    continue
+                needed, alone = 0, False
+                if budget is not None:
+                    needed, result = estimate(source, output)
+                    if result is not None:
+                        yield report(result)
+                        continue
+                    # No hay un final al que posponerla: se convierte sin nada más en curso
+                    alone = needed > budget
+                output.parent.mkdir(parents=True, exist_ok=True)
+                queued[source] = (output, needed, alone, False)
+                busy.add(source)
+
+            yield from finished_results()
+            submit_queued()
+
+            # El manifiesto se reescribe entero: se guarda cada cierto tiempo, no en cada lote
+            if time.monotonic() - last_save >= WATCH_MANIFEST_SAVE_INTERVAL:
+                manifest.save()
+                last_save = time.monotonic()
+
+        # Cancelado: lo que está en marcha termina y lo que espera turno se descarta
+        queued.clear()
+        for future in in_flight:
+            future.cancel()
+        while in_flight:
+            yield from finished_results(timeout=None)
+    finally:
+        watcher.close()
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        if manifest:
+            manifest.save()
+
+def new_stats():
+    """Estadísticas vacías de una conversión de carpeta."""
+    return {
+        'converted': 0, 'failed': 0, 'rejected': 0, 'skipped': 0, 'planned': 0, 'total': 0,
+        'stale': [],
+        'cache_hits': 0, 'cache_misses': 0, 'bytes_in': 0, 'bytes_out': 0,
+        'verified': 0, 'larger': [],
+    }
+
+def update_stats(stats, result):
+    """Acumula un registro de `iter_convert_folder` en las estadísticas."""
+    status = result['status']
+    if status == 'stale':
+        stats['stale'].append(result['output'])
+        return
+
+    stats['total'] = result['total']
+    if result['cache_hit'] is not None:
+        stats['cache_hits' if result['cache_hit'] else 'cache_misses'] += 1
+    if result['verified']:
+        stats['verified'] += 1
+    if result['larger_than_source']:
+        stats['larger'].append(result['output'])
+    if status == 'failed':
+        stats['failed'] += 1
+    elif status == 'rejected':
+        stats['rejected'] += 1
+    elif status == 'skipped':
+        stats['skipped'] += 1
+    elif status == 'planned':
+        stats['planned'] += 1
+    else:
+        stats['converted'] += 1
+        stats['bytes_in'] += result['bytes_in']
+        stats['bytes_out'] += result['bytes_out']
+
+def convert_folder_images_to_webp(input_folder, output_folder, workers=None, progress_callback=None, **options):
+    """
+    Convierte todas las imágenes en una carpeta a formato WebP.
+    `progress_callback(actual, total, nombre)` se llama cada vez que termina un archivo.
+    `options` son las mismas que acepta `iter_convert_folder` (incremental, profile...).
+
+    Devuelve un diccionario con las estadísticas (ver `new_stats`).
+    """
+    stats = new_stats()
+    for result in iter_convert_folder(input_folder, output_folder, workers, **options):
+        update_stats(stats, result)
+        if result['status'] == 'stale':
+            continue
+        if progress_callback:
+            progress_callback(result['done'], result['total'], result['source'].name)
+        if result['status'] == 'failed':
+            print(f"Error al convertir {result['source'].name}: {result['error']}")
+        elif result['status'] == 'rejected':
+            print(f"Omitida {result['source'].name}: {result['error']}")
+
+    return stats
+
+def build_report(args, stats, records, elapsed):
+    """
+    Resumen JSON de una ejecución de la línea de comandos: opciones usadas,
+    totales, rendimiento global y el detalle de cada archivo.
+    """
+    processed = stats['converted'] + stats['failed']
+    files = [
+        {
+            'source': str(r['source']),
+            'output': str(r['output']),
+            'status': r['status'],
+            'bytes_in': r['bytes_in'],
+            'bytes_out': r['bytes_out'],
+            'bytes_saved': r['bytes_in'] - r['bytes_out'] if r['status'] in ('converted', 'cached') else 0,
+            'encode_time': r['encode_time'],
+            'stage_times': r['stage_times'],
+            'verified': r['verified'],
+            'larger_than_source': r['larger_than_source'],
+            'error': r['error'],
+        }
+        for r in records
+        if r['status'] != 'stale'
+    ]
+    return {
+        'input': str(args.input),
+        'output': str(args.output),
+        'options': {
+            'workers': args.workers or DEFAULT_WORKERS,
+            'profile': args.profile,
+            'recursive': args.recursive,
+            'incremental': args.incremental,
+            'dry_run': args.dry_run,
+            'dedup': args.cache_dir,
+            'max_dimension': args.max_dimension,
+            'variants': args.variants,
+            'staged': args.staged,
+            'mmap': args.mmap,
+            'keep_metadata': args.keep_metadata,
+            'auto_orient': args.auto_orient,
+            'verify': args.verify,
+            'fsync': args.fsync,
+            'memory_budget_mb': args.memory_budget or None,
+            'oversize': args.oversize,
+        },
+        'started_at': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - elapsed)),
+        'elapsed_seconds': elapsed,
+        'files_per_second': processed / elapsed if elapsed else None,
+        'mb_per_second': stats['bytes_in'] / elapsed / 1e6 if elapsed else None,
+        'summary': {
+            'total': stats['total'],
+            'converted': stats['converted'],
+            'failed': stats['failed'],
+            'rejected': stats['rejected'],
+            'skipped': stats['skipped'],
+            'planned': stats['planned'],
+            'cache_hits': stats['cache_hits'],
+            'cache_misses': stats['cache_misses'],
+            'bytes_in': stats['bytes_in'],
+            'bytes_out': stats['bytes_out'],
+            'bytes_saved': stats['bytes_in'] - stats['bytes_out'],
+            'verified': stats['verified'],
+            'larger_than_source': [str(o) for o in stats['larger']],
+            'stale': [str(o) for o in stats['stale']],
+        },
+        'failures': [f for f in files if f['status'] in ('failed', 'rejected')],
+        'files': files,
+    }
+
+def _parse_widths(value):
+    try:
+        return [int(w) for w in value.split(",") if w.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"lista de anchos no válida: {value}") from None
+
+def parse_args(argv=None):
+    """Argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Convierte una carpeta de imágenes a formato WebP.",
+    )
+    parser.add_argument("input", nargs="?", help="Carpeta de imágenes a convertir")
+    parser.add_argument("output", nargs="?", help="Carpeta donde guardar las imágenes convertidas")
+    parser.add_argument("-w", "--workers", type=int, help=f"Procesos en paralelo (por defecto {DEFAULT_WORKERS})")
+    parser.add_argument("-p", "--profile", choices=list(ENCODE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Perfil de codificación")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Incluir subcarpetas")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="Convertir solo imágenes nuevas o modificadas (usa el manifiesto)")
+    parser.add_argument("--prune-stale", action="store_true",
+                        help="Con --incremental, eliminar las salidas cuyo origen ya no existe")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reutilizar imágenes duplicadas desde la caché")
+    parser.add_argument("--cache-dir", default=DEDUP_CACHE_DIR, metavar="CARPETA",
+                        help="Carpeta de la caché de --dedup (por defecto %(default)s)")
+    parser.add_argument("--max-dimension", type=int, help="Reducir las imágenes a este lado máximo (px)")
+    parser.add_argument("--resample", choices=RESAMPLE_FILTERS, default=DEFAULT_RESAMPLE,
+                        help="Filtro de remuestreo al reducir")
+    parser.add_argument("--variants", type=_parse_widths, metavar="ANCHOS",
+                        help="Generar variantes con estos anchos, p. ej. 320,640,1280")
+    parser.add_argument("--variant-pattern", default=DEFAULT_VARIANT_PATTERN,
+                        help="Nombre de cada variante (por defecto %(default)s)")
+    parser.add_argument("--keep-metadata", action="store_true",
+                        help="Conservar EXIF, XMP y perfil ICC en los WebP")
+    parser.add_argument("--auto-orient", action=argparse.BooleanOptionalAction, default=DEFAULT_AUTO_ORIENT,
+                        help="Enderezar las imágenes según su orientación EXIF (por defecto %(default)s)")
+    parser.add_argument("--verify", type=float, default=0.0, metavar="FRACCIÓN",
+                        help="Decodificar y comprobar esta fracción de las salidas "
+                             "(1 para todas, p. ej. 0.1 para el 10%%)")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default=DEFAULT_FSYNC_POLICY,
+                        help="Forzar a disco las salidas: nunca, por archivo o por lotes")
+    parser.add_argument("--memory-budget", type=int, default=MEMORY_BUDGET_MB, metavar="MB",
+                        help="Memoria máxima prevista para las conversiones en curso "
+                             "(por defecto %(default)s MB; 0 para no limitar)")
+    parser.add_argument("--oversize", choices=OVERSIZE_POLICIES, default=DEFAULT_OVERSIZE_POLICY,
+                        help="Imágenes que no caben en el presupuesto: convertirlas al final "
+                             "de una en una (serial) o rechazarlas (reject)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Leer las imágenes de origen mapeadas en memoria")
+    parser.add_argument("--staged", action="store_true",
+                        help="Separar lectura, codificación y escritura en etapas (discos lentos o de red)")
+    parser.add_argument("--io-threads", type=int, default=DEFAULT_IO_THREADS,
+                        help="Hilos de E/S del modo --staged (por defecto %(default)s)")
+    parser.add_argument("--queue-depth", type=int, help="Tamaño de las colas entre etapas del modo --staged")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Guardar un punto de control; si el trabajo se interrumpe, "
+                             "relanzarlo igual continúa donde se quedó")
+    parser.add_argument("--watch", action="store_true",
+                        help="Seguir vigilando la carpeta y convertir cada imagen nueva (Ctrl+C para salir)")
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE,
+                        help="Con --watch, segundos sin cambios antes de convertir un archivo "
+                             "(por defecto %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL,
+                        help="Con --watch, segundos entre recorridos si no hay inotify")
+    parser.add_argument("--polling", action="store_true",
+                        help="Con --watch, recorrer la carpeta periódicamente en lugar de usar inotify")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="Mostrar qué se convertiría sin escribir nada")
+    parser.add_argument("--report", metavar="ARCHIVO.json", help="Guardar un informe JSON de la ejecución")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No mostrar una línea por archivo")
+    args = parser.parse_args(argv)
+
+    if args.max_dimension and args.variants:
+        parser.error("--max-dimension y --variants no se pueden usar a la vez")
+    if args.staged and (args.variants or args.dedup or args.verify):
+        parser.error("--staged no se puede combinar con --variants, --dedup ni --verify")
+    if not 0 <= args.verify <= 1:
+        parser.error("--verify debe estar entre 0 y 1")
+    baseline = (args.workers or DEFAULT_WORKERS) * WORKER_BASELINE_MB
+    if args.memory_budget and args.memory_budget <= baseline:
+        parser.error(
+            f"--memory-budget debe superar la memoria base de los procesos ({baseline} MB); "
+            "reduzca --workers o use 0 para no limitar"
+        )
+    if args.watch and (args.dry_run or args.staged or args.checkpoint):
+        parser.error("--watch no se puede combinar con --dry-run, --staged ni --checkpoint")
+    # Las carpetas que falten solo se piden si hay alguien al otro lado (no en cron)
+    if (args.input is None or args.output is None) and not sys.stdin.isatty():
+        parser.error("indique la carpeta de entrada y la de salida")
+    args.cache_dir = args.cache_dir if args.dedup else None
+    return args
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos. Sin argumentos, y solo desde una
+    terminal, pide las carpetas de forma interactiva; con ellos funciona sin
+    intervención (cron, contenedores).
+
+    Returns:
+        int: 0 si todo fue bien, 1 si alguna imagen no se pudo convertir o fue rechazada
+    """
+    args = parse_args(argv)
+    if args.input is None:
+        args.input = input("Ingrese la ruta de la carpeta de imágenes a convertir: ")
+    if args.output is None:
+        args.output = input("Ingrese la Ruta para las imagenes convertidas: ")
+
+    stats = new_stats()
+    records = []
+    pipeline_stats = {}
+    start = time.perf_counter()
+    if args.watch:
+        results = watch_folder(
+            args.input,
+            args.output,
+            args.workers,
+            recursive=args.recursive,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            use_inotify=not args.polling,
+            cache_dir=args.cache_dir,
+            profile=args.profile,
+            max_dimension=args.max_dimension,
+            resample=args.resample,
+            variant_widths=args.variants,
+            variant_pattern=args.variant_pattern,
+            use_mmap=args.mmap,
+            keep_metadata=args.keep_metadata,
+            auto_orient=args.auto_orient,
+            verify_sample=args.verify,
+            fsync_policy=args.fsync,
+            memory_budget=args.memory_budget or None,
+            oversize=args.oversize,
+        )
+        print(f"Vigilando {args.input} (Ctrl+C para salir)")
+    else:
+        results = iter_convert_folder(
+            args.input,
+            args.output,
+            args.workers,
+            recursive=args.recursive,
+            incremental=args.incremental,
+            prune_stale=args.prune_stale,
+            cache_dir=args.cache_dir,
+            profile=args.profile,
+            max_dimension=args.max_dimension,
+            resample=args.resample,
+            variant_widths=args.variants,
+            variant_pattern=args.variant_pattern,
+            dry_run=args.dry_run,
+            staged=args.staged,
+            io_threads=args.io_threads,
+            queue_depth=args.queue_depth,
+            pipeline_stats=pipeline_stats,
+            use_mmap=args.mmap,
+            memory_budget=args.memory_budget or None,
+            oversize=args.oversize,
+            checkpoint=args.checkpoint,
+            keep_metadata=args.keep_metadata,
+            auto_orient=args.auto_orient,
+            verify_sample=args.verify,
+            fsync_policy=args.fsync,
+        )
+
+    try:
+        for result in results:
+            update_stats(stats, result)
+            if args.report:
+                records.append(result)
+            if result['status'] == 'stale':
+                print(f"Salida huérfana (el origen ya no existe): {result['output']}")
+                continue
+            if args.quiet and not result['error']:
+                continue
+
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            line = (
+                f"[{result['done']}/{result['total']}] {result['source'].name} ({result['status']}) "
+                f"- {result['done'] / elapsed:.1f} img/s, {stats['bytes_in'] / elapsed / 1e6:.1f} MB/s"
+            )
+            if result['error']:
+                line += f" - Error: {result['error']}"
+            print(line)
+    except KeyboardInterrupt:
+        if not args.watch:
+            raise
+        results.close()
+        print("Vigilancia detenida")
+    elapsed = time.perf_counter() - start
+
+    if stats['skipped']:
+        print(f"{stats['skipped']} imágenes sin cambios omitidas")
+    if stats['rejected']:
+        print(f"{stats['rejected']} imágenes rechazadas por su tamaño (ver el motivo de cada una)")
+    if args.verify:
+        print(f"{stats['verified']} salidas verificadas correctamente")
+    if stats['larger']:
+        print(f"{len(stats['larger'])} salidas ocupan más que su original:")
+        for output in stats['larger'][:20]:
+            print(f"  {output}")
+    if args.dedup:
+        print(f"Caché de duplicados: {stats['cache_hits']} aciertos, {stats['cache_misses']} fallos")
+    if pipeline_stats:
+        print(
+            f"Etapas: lectura {pipeline_stats['utilisation']['read']:.0%}, "
+            f"CPU {pipeline_stats['utilisation']['process']:.0%}, "
+            f"escritura {pipeline_stats['utilisation']['write']:.0%} de ocupación; "
+            f"cola hacia la CPU {pipeline_stats['queue_depth_avg']['to_process']:.1f} de media "
+            f"(límite: {pipeline_stats['bottleneck']})"
+        )
+    if args.dry_run:
+        print(f"Simulación: se convertirían {stats['planned']} de {stats['total']} imágenes")
+    else:
+        print(f"{stats['converted']} de {stats['total']} imágenes convertidas y guardadas en {args.output}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            report = build_report(args, stats, records, elapsed)
+            if pipeline_stats:
+                report['pipeline'] = pipeline_stats
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Informe guardado en {args.report}")
+
+    return 1 if stats['failed'] or stats['rejected'] else 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Caché de deduplicación por contenido para la conversión a WebP.
+
+Cada resultado se guarda una sola vez bajo una clave que combina el hash de la
+imagen de origen y los ajustes de codificación. Las imágenes idénticas con otro
+nombre se materializan desde la caché (enlace duro, reflink o copia) en lugar
+de volver a codificarse.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+
+from atomic_io import atomic_output
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl FICLONE de Linux (clonado copy-on-write en Btrfs, XFS...)
+_FICLONE = 0x40049409
+
+def cache_key(source_digest, settings):
+    """Clave de la caché: hash del origen + ajustes de codificación."""
+    payload = source_digest + json.dumps(settings, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _reflink(src, dst):
+    """Intenta clonar `src` en `dst` sin copiar datos. Lanza OSError si no es posible."""
+    if fcntl is None:
+        raise OSError("reflink no disponible en esta plataforma")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+
+class DedupCache:
+    """
+    Almacén de blobs WebP direccionado por contenido
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Inicializar la caché
+
+        Args:
+            cache_dir (str): Carpeta donde se guardan los blobs
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+
+    def blob_path(self, key):
+        """Ruta del blob para una clave (repartida en subcarpetas por prefijo)"""
+        return self.cache_dir / key[:2] / (key + ".webp")
+
+    def contains(self, key):
+        """Indica si la caché tiene un blob para la clave"""
+        return self.blob_path(key).exists()
+
+    def materialize(self, key, output_file, fsync=False):
+        """
+        Coloca en `output_file` el blob de la caché, si existe.
+
+        Se prepara en un temporal y se renombra (ver `atomic_io.atomic_output`),
+        así que nunca se escribe dentro de un archivo que pudiera ser un enlace
+        a otro blob.
+
+        Returns:
+            bool: True si hubo acierto en la caché
+        """
+        blob = self.blob_path(key)
+        if not blob.exists():
+            return False
+
+        with atomic_output(output_file, fsync) as tmp_file:
+            try:
+                os.link(blob, tmp_file)
+            except OSError:
+                try:
+                    _reflink(blob, tmp_file)
+                except OSError:
+                    shutil.copyfile(blob, tmp_file)
+        return True
+
+    def store(self, key, output_file):
+        """Guarda una copia de `output_file` en la caché (escritura atómica)"""
+        blob = self.blob_path(key)
+        if blob.exists():
+            return
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_blob = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+        shutil.copyfile(output_file, tmp_blob)
+        os.replace(tmp_blob, blob)
@@ -3,20 +3,37 @@
 import customtkinter as ctk
 from tkinter import filedialog
 import tkinter.messagebox as messagebox
-from PIL import Image
+import multiprocessing
 import threading
-import pathlib
+
+from config import (
+    DEFAULT_WORKERS, DEDUP_CACHE_DIR, ENCODE_PROFILES, DEFAULT_PROFILE,
+    RESAMPLE_FILTERS, DEFAULT_RESAMPLE, DEFAULT_AUTO_ORIENT, PROGRESS_REFRESH_MS,
+)
+from converter_img_webp import iter_convert_folder, new_stats, update_stats
+from job_control import JobCheckpoint, JobController
+from progress import ProgressReporter, format_bytes, format_eta
 
 class ImageConverterApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, workers=None):
         super().__init__()
 
+        # Número de procesos usados por el motor de conversión en paralelo
+        self.workers = workers or DEFAULT_WORKERS
+
+        # Control y progreso del trabajo en curso (None si no hay ninguno)
+        self.controller = None
+        self.progress = None
+        self.conversion_thread = None
+        # Se pidió cerrar la ventana; se cierra cuando termine el hilo de conversión
+        self.closing = False
+
         self.title("Conversor de Imágenes a WebP")
-        self.geometry("600x300")
+        self.geometry("600x540")
 
         # Configure grid layout
         self.grid_columnconfigure(1, weight=1)
-        self.grid_rowconfigure((0, 1, 2, 3), weight=1)
+        self.grid_rowconfigure(tuple(range(10)), weight=1)
 
         # Input Folder
         self.input_label = ctk.CTkLabel(self, text="Carpeta de Entrada:")
@@ -46,20 +63,103 @@ class ImageConverterApp(ctk.CTk):
         )
         self.output_button.grid(row=1, column=2, padx=10, pady=10, sticky="e")
 
-        # Convert Button
+        # Encode Profile
+        self.profile_label = ctk.CTkLabel(self, text="Perfil de Codificación:")
+        self.profile_label.grid(row=2, column=0, padx=10, pady=10, sticky="w")
+
+        self.profile_var = ctk.StringVar(value=DEFAULT_PROFILE)
+        self.profile_menu = ctk.CTkOptionMenu(
+            self, variable=self.profile_var, values=list(ENCODE_PROFILES)
+        )
+        self.profile_menu.grid(row=2, column=1, padx=10, pady=10, sticky="w")
+
+        # Max Dimension
+        self.max_dimension_label = ctk.CTkLabel(self, text="Dimensión Máxima (px):")
+        self.max_dimension_label.grid(row=3, column=0, padx=10, pady=10, sticky="w")
+
+        self.max_dimension_entry = ctk.CTkEntry(
+            self, placeholder_text="Vacío para conservar el tamaño original"
+        )
+        self.max_dimension_entry.grid(row=3, column=1, padx=10, pady=10, sticky="ew")
+
+        self.resample_var = ctk.StringVar(value=DEFAULT_RESAMPLE)
+        self.resample_menu = ctk.CTkOptionMenu(
+            self, variable=self.resample_var, values=RESAMPLE_FILTERS
+        )
+        self.resample_menu.grid(row=3, column=2, padx=10, pady=10, sticky="e")
+
+        # Incremental Mode
+        self.incremental_var = ctk.BooleanVar(value=False)
+        self.incremental_check = ctk.CTkCheckBox(
+            self,
+            text="Convertir solo imágenes nuevas o modificadas",
+            variable=self.incremental_var,
+        )
+        self.incremental_check.grid(
+            row=4, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="w"
+        )
+
+        # Dedup Cache
+        self.dedup_var = ctk.BooleanVar(value=False)
+        self.dedup_check = ctk.CTkCheckBox(
+            self,
+            text="Reutilizar imágenes duplicadas desde la caché",
+            variable=self.dedup_var,
+        )
+        self.dedup_check.grid(
+            row=5, column=0, columnspan=3, padx=10, pady=5, sticky="w"
+        )
+
+        # Metadata / Orientation
+        self.metadata_var = ctk.BooleanVar(value=False)
+        self.metadata_check = ctk.CTkCheckBox(
+            self,
+            text="Conservar metadatos (EXIF, XMP, ICC)",
+            variable=self.metadata_var,
+        )
+        self.metadata_check.grid(
+            row=6, column=0, columnspan=2, padx=10, pady=(5, 10), sticky="w"
+        )
+
+        self.orient_var = ctk.BooleanVar(value=DEFAULT_AUTO_ORIENT)
+        self.orient_check = ctk.CTkCheckBox(
+            self,
+            text="Corregir orientación",
+            variable=self.orient_var,
+        )
+        self.orient_check.grid(row=6, column=2, padx=10, pady=(5, 10), sticky="w")
+
+        # Convert / Pause / Cancel Buttons
         self.convert_button = ctk.CTkButton(
             self, text="Convertir", command=self.convert_images
         )
-        self.convert_button.grid(
-            row=2, column=0, columnspan=3, padx=10, pady=10, sticky="ew"
+        self.convert_button.grid(row=7, column=0, padx=10, pady=10, sticky="ew")
+
+        self.pause_button = ctk.CTkButton(
+            self, text="Pausar", command=self.toggle_pause, state="disabled"
+        )
+        self.pause_button.grid(row=7, column=1, padx=10, pady=10, sticky="ew")
+
+        self.cancel_button = ctk.CTkButton(
+            self, text="Cancelar", command=self.cancel_conversion, state="disabled"
         )
+        self.cancel_button.grid(row=7, column=2, padx=10, pady=10, sticky="ew")
+
+        # Progress Bar
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.grid(
+            row=8, column=0, columnspan=3, padx=10, pady=10, sticky="ew"
+        )
+        self.progress_bar.set(0)
 
         # Status Label
         self.status_label = ctk.CTkLabel(self, text="", text_color="green")
         self.status_label.grid(
-            row=3, column=0, columnspan=3, padx=10, pady=10, sticky="ew"
+            row=9, column=0, columnspan=3, padx=10, pady=10, sticky="ew"
         )
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def browse_input_folder(self):
         folder_selected = filedialog.askdirectory()
         if folder_selected:
@@ -81,31 +181,117 @@ class ImageConverterApp(ctk.CTk):
             messagebox.showerror("Error", "Por favor, seleccione ambas carpetas.")
             return
 
+        max_dimension = self.max_dimension_entry.get().strip()
+        if max_dimension and (not max_dimension.isdigit() or int(max_dimension) == 0):
+            messagebox.showerror("Error", "La dimensión máxima debe ser un número entero positivo.")
+            return
+
+        checkpoint = JobCheckpoint(output_folder)
+        if checkpoint.exists() and not messagebox.askyesno(
+            "Trabajo interrumpido",
+            "Hay una conversión sin terminar en la carpeta de salida.\n"
+            "¿Desea continuarla donde se quedó? (No: empezar de nuevo)",
+        ):
+            checkpoint.clear()
+
+        self.controller = JobController()
+        self.progress = ProgressReporter()
         self.convert_button.configure(state="disabled")
+        self.pause_button.configure(state="normal", text="Pausar")
+        self.cancel_button.configure(state="normal")
+        self.progress_bar.set(0)
         self.status_label.configure(text="Procesando...", text_color="blue")
 
         # Ejecutar la conversión en un hilo separado para no congelar la interfaz
-        conversion_thread = threading.Thread(
+        self.conversion_thread = threading.Thread(
             target=self._run_conversion_task,
             args=(input_folder, output_folder),
+            kwargs={
+                "incremental": self.incremental_var.get(),
+                "cache_dir": DEDUP_CACHE_DIR if self.dedup_var.get() else None,
+                "profile": self.profile_var.get(),
+                "max_dimension": int(max_dimension) if max_dimension else None,
+                "resample": self.resample_var.get(),
+                "keep_metadata": self.metadata_var.get(),
+                "auto_orient": self.orient_var.get(),
+                "controller": self.controller,
+                "checkpoint": True,
+            },
             daemon=True,
         )
-        conversion_thread.start()
+        self.conversion_thread.start()
+        self.after(PROGRESS_REFRESH_MS, self._refresh_progress)
+
+    def toggle_pause(self):
+        """Pausa o reanuda el trabajo en curso; las imágenes ya enviadas terminan."""
+        if self.controller is None:
+            return
+        if self.controller.paused:
+            self.controller.resume()
+            self.pause_button.configure(text="Pausar")
+            self.status_label.configure(text="Procesando...", text_color="blue")
+        else:
+            self.controller.pause()
+            self.pause_button.configure(text="Reanudar")
+            self.status_label.configure(text="En pausa", text_color="orange")
 
-    def _run_conversion_task(self, input_folder, output_folder):
+    def cancel_conversion(self):
+        """Cancela el trabajo en curso; lo terminado queda en el punto de control."""
+        if self.controller is None:
+            return
+        self.controller.cancel()
+        self.pause_button.configure(state="disabled")
+        self.cancel_button.configure(state="disabled")
+        self.status_label.configure(text="Cancelando...", text_color="orange")
+
+    def _on_close(self):
+        """
+        Al cerrar la ventana se cancela el trabajo y se espera a que el hilo de
+        conversión guarde su punto de control antes de destruirla.
+        """
+        if self.conversion_thread is None or not self.conversion_thread.is_alive():
+            self.destroy()
+            return
+        if not self.closing:
+            self.closing = True
+            self.cancel_conversion()
+            self.status_label.configure(text="Cancelando y guardando el progreso...", text_color="orange")
+            self.after(PROGRESS_REFRESH_MS, self._close_when_finished)
+
+    def _close_when_finished(self):
+        """Destruye la ventana en cuanto termina el hilo de conversión."""
+        if self.conversion_thread.is_alive():
+            self.after(PROGRESS_REFRESH_MS, self._close_when_finished)
+        else:
+            self.destroy()
+
+    def _run_conversion_task(self, input_folder, output_folder, **options):
         """
         Busca y convierte imágenes. Esta función está diseñada para ejecutarse en un hilo de fondo.
+        `options` se pasan a `iter_convert_folder` (incremental, cache_dir, profile...).
         """
         try:
-            valid_exts = [".jpg", ".jpeg", ".png", ".bmp", ".gif"]
-            input_path = pathlib.Path(input_folder)
-            image_files = [
-                f
-                for f in input_path.rglob("*")
-                if f.suffix.lower() in valid_exts and f.is_file()
-            ]
-
-            if not image_files:
+            stats = new_stats()
+            results = iter_convert_folder(
+                input_folder,
+                output_folder,
+                self.workers,
+                recursive=True,
+                **options,
+            )
+            for result in results:
+                update_stats(stats, result)
+                if result['status'] == 'stale':
+                    print(f"Salida huérfana (el origen ya no existe): {result['output']}")
+                    continue
+                if result['status'] == 'failed':
+                    print(f"Error al convertir {result['source'].name}: {result['error']}")
+                elif result['status'] == 'rejected':
+                    print(f"Omitida {result['source'].name}: {result['error']}")
+                self.progress.update(result)
+
+            cancelado = options["controller"].cancelled if options.get("controller") else False
+            if stats['total'] == 0 and not cancelado:
                 self.after(
                     0,
                     self._update_ui_after_conversion,
@@ -115,30 +301,40 @@ class ImageConverterApp(ctk.CTk):
                 )
                 return
 
-            output_path = pathlib.Path(output_folder)
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            convertidos = 0
-            errores = 0
-            for image_file in image_files:
-                output_file = output_path / (image_file.stem + ".webp")
-                try:
-                    with Image.open(image_file) as img:
-                        img.save(output_file, "WEBP")
-                    convertidos += 1
-                except Exception as e:
-                    print(f"Error al convertir {image_file.name}: {e}")
-                    errores += 1
-
-            if convertidos > 0:
+            convertidos = stats['converted']
+            errores = stats['failed']
+            omitidas = stats['skipped']
+            rechazadas = stats['rejected']
+            huerfanas = stats['stale']
+
+            if cancelado:
+                msg = (
+                    f"Conversión cancelada: {convertidos} imagen(es) convertidas. "
+                    "Vuelva a convertir la misma carpeta para continuar donde se quedó."
+                )
+                self.after(0, self._update_ui_after_conversion, msg, "orange", "warning")
+            elif convertidos > 0 or (omitidas > 0 and errores == 0):
                 msg = f"{convertidos} imagen(es) convertidas y guardadas."
+                if omitidas > 0:
+                    msg += f"\n{omitidas} imagen(es) sin cambios omitidas."
                 if errores > 0:
                     msg += f"\n{errores} imagen(es) no se pudieron convertir."
+                if rechazadas > 0:
+                    msg += f"\n{rechazadas} imagen(es) demasiado grandes para la memoria disponible."
+                if huerfanas:
+                    msg += f"\n{len(huerfanas)} salida(s) huérfana(s) cuyo origen ya no existe."
+                if options.get("cache_dir"):
+                    msg += (
+                        f"\nCaché de duplicados: {stats['cache_hits']} aciertos, "
+                        f"{stats['cache_misses']} fallos."
+                    )
                 self.after(0, self._update_ui_after_conversion, msg, "green", "info")
             else:
                 msg = "No se pudo convertir ninguna imagen."
                 if errores > 0:
                     msg += f"\nOcurrieron {errores} errores durante el proceso."
+                if rechazadas > 0:
+                    msg += f"\n{rechazadas} imagen(es) demasiado grandes para la memoria disponible."
                 self.after(0, self._update_ui_after_conversion, msg, "red", "error")
 
         except Exception as e:
@@ -151,13 +347,43 @@ class ImageConverterApp(ctk.CTk):
                 "error",
             )
 
+    def _refresh_progress(self):
+        """
+        Refresca la barra y la etiqueta de progreso a ritmo fijo mientras dura el
+        trabajo. El hilo de conversión solo anota resultados en `self.progress`;
+        la interfaz se actualiza desde aquí, en el hilo principal.
+        """
+        if self.progress is None or self.closing:
+            return
+        snap = self.progress.snapshot()
+        self.progress_bar.set(snap['fraction'])
+        # En pausa o cancelando, la etiqueta muestra ese estado en lugar del avance
+        if not self.controller or not (self.controller.paused or self.controller.cancelled):
+            self.status_label.configure(
+                text=(
+                    f"Procesando... {snap['done']}/{snap['total']} · "
+                    f"{snap['files_per_second']:.1f} img/s · "
+                    f"quedan {format_eta(snap['eta_seconds'])} · "
+                    f"{format_bytes(snap['bytes_saved'])} ahorrados"
+                )
+            )
+        self.after(PROGRESS_REFRESH_MS, self._refresh_progress)
+
     def _update_ui_after_conversion(self, message, color, message_type):
         """
         Actualiza la etiqueta de estado y muestra un cuadro de mensaje.
         Se llama desde el hilo principal usando `self.after`.
         """
+        if self.closing:
+            return
+        if self.progress is not None:
+            self.progress_bar.set(self.progress.snapshot()['fraction'])
         self.status_label.configure(text=message, text_color=color)
+        self.controller = None
+        self.progress = None
         self.convert_button.configure(state="normal")
+        self.pause_button.configure(state="disabled", text="Pausar")
+        self.cancel_button.configure(state="disabled")
 
         if message_type == "info":
             messagebox.showinfo("Conversión Completada", message)
@@ -167,5 +393,6 @@ class ImageConverterApp(ctk.CTk):
             messagebox.showerror("Error", message)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = ImageConverterApp()
     app.mainloop()
@@ -0,0 +1,167 @@
+"""
+Control de los trabajos de conversión: cancelar, pausar y reanudar, y punto de
+control en disco para continuar un trabajo interrumpido.
+
+El `JobController` se consulta entre archivo y archivo: la pausa detiene el
+envío de nuevas imágenes al pool (las que ya están en curso terminan) y la
+cancelación lo corta definitivamente. El `JobCheckpoint` guarda qué imágenes
+del trabajo ya terminaron, de modo que al relanzarlo con la misma carpeta y
+los mismos ajustes solo se convierte lo que faltaba.
+"""
+
+import json
+import os
+import pathlib
+import threading
+
+from config import CHECKPOINT_FILENAME, CHECKPOINT_VERSION, CHECKPOINT_INTERVAL
+
+class JobController:
+    """
+    Estado compartido entre la interfaz (que pausa, reanuda o cancela) y el
+    hilo de conversión (que lo consulta con `wait_if_paused`).
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set() and not self.cancelled
+
+    def pause(self):
+        """Dejar de enviar imágenes nuevas hasta que se llame a `resume`"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        """Terminar el trabajo; también despierta un trabajo en pausa"""
+        self._cancelled.set()
+        self._running.set()
+
+    def wait_if_paused(self):
+        """
+        Bloquea mientras el trabajo está en pausa.
+
+        Returns:
+            bool: False si el trabajo se canceló y no debe seguir
+        """
+        self._running.wait()
+        return not self.cancelled
+
+class JobCheckpoint:
+    """
+    Punto de control de un trabajo almacenado como JSON en la carpeta de salida
+    """
+
+    def __init__(self, output_folder, interval=CHECKPOINT_INTERVAL):
+        """
+        Args:
+            output_folder (str): Carpeta de salida del trabajo
+            interval (int): Cada cuántas imágenes terminadas se guarda en disco
+        """
+        self.path = pathlib.Path(output_folder) / CHECKPOINT_FILENAME
+        self.interval = interval
+        self.done = {}
+        self._pending = 0
+
+    @staticmethod
+    def _key(source):
+        return str(pathlib.Path(source).resolve())
+
+    def exists(self):
+        return self.path.exists()
+
+    def load(self, input_folder, settings):
+        """
+        Cargar las imágenes ya terminadas si el punto de control corresponde al
+        mismo trabajo (misma carpeta de entrada y mismos ajustes); si no, se
+        empieza de cero.
+
+        Returns:
+            int: Número de imágenes ya terminadas
+        """
+        self.input_folder = str(pathlib.Path(input_folder).resolve())
+        self.settings = settings
+        self.done = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (ValueError, OSError) as e:
+            print(f"Punto de control ilegible, se ignorará: {e}")
+            return 0
+        if (
+            data.get("version") == CHECKPOINT_VERSION
+            and data.get("input") == self.input_folder
+            and data.get("settings") == settings
+        ):
+            self.done = data.get("done", {})
+        return len(self.done)
+
+    def is_done(self, source):
+        """
+        Indicar si `source` terminó en este trabajo y no ha cambiado desde
+        entonces (mismo tamaño y fecha de modificación, como en el manifiesto)
+        """
+        entry = self.done.get(self._key(source))
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+    def outputs_for(self, source):
+        """Salidas que produjo `source` en este trabajo (lista vacía si no terminó)"""
+        entry = self.done.get(self._key(source))
+        return entry["outputs"] if entry else []
+
+    def mark_done(self, source, outputs):
+        """Registrar una imagen terminada; se guarda en disco cada `interval` imágenes"""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            # El origen ya no está: no hay nada que saltarse al continuar
+            return
+        self.done[self._key(source)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "outputs": [str(o) for o in outputs],
+        }
+        self._pending += 1
+        if self._pending >= self.interval:
+            self.save()
+
+    def save(self):
+        """Escribir el punto de control en disco"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CHECKPOINT_VERSION,
+                "input": self.input_folder,
+                "settings": self.settings,
+                "done": self.done,
+            }, f)
+        os.replace(tmp_path, self.path)
+        self._pending = 0
+
+    def clear(self):
+        """Eliminar el punto de control (el trabajo terminó)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.done = {}
+        self._pending = 0
@@ -0,0 +1,158 @@
+"""
+Manifiesto persistente para la conversión incremental a WebP.
+
+Guarda, por cada imagen de origen, su tamaño, fecha de modificación, hash del
+contenido y los ajustes de codificación usados, junto con la ruta de salida.
+Así una nueva ejecución sobre la misma carpeta solo convierte lo nuevo o lo
+modificado, y puede detectar las salidas cuyo origen ya no existe.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+
+from config import MANIFEST_FILENAME, MANIFEST_VERSION
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ConversionManifest:
+    """
+    Manifiesto de conversiones almacenado como JSON en la carpeta de salida
+    """
+
+    def __init__(self, output_folder):
+        """
+        Cargar (o crear vacío) el manifiesto de una carpeta de salida
+
+        Args:
+            output_folder (str): Carpeta donde se guardan las imágenes convertidas
+        """
+        self.path = pathlib.Path(output_folder) / MANIFEST_FILENAME
+        self.entries = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(source):
+        return str(pathlib.Path(source).resolve())
+
+    @staticmethod
+    def _outputs(entry):
+        """Archivos producidos por una entrada (todas sus variantes, si las tiene)"""
+        return entry.get("variants") or [entry["output"]]
+
+    def outputs_for(self, source):
+        """Devuelve la lista de salidas registradas para `source` (vacía si no hay entrada)"""
+        entry = self.entries.get(self._key(source))
+        return self._outputs(entry) if entry else []
+
+    def load(self):
+        """Leer el manifiesto desde disco; si no existe o está dañado se empieza de cero"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Manifiesto ilegible, se reconstruirá: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Escribir el manifiesto en disco (solo si hubo cambios)"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def is_up_to_date(self, source, output, settings):
+        """
+        Indica si la salida registrada para `source` sigue siendo válida.
+
+        Se compara primero tamaño y fecha de modificación; solo si la fecha cambió
+        pero el tamaño no, se recalcula el hash para descartar un simple `touch`.
+        """
+        entry = self.entries.get(self._key(source))
+        if entry is None:
+            return False
+        if entry["settings"] != settings or entry["output"] != str(output):
+            return False
+        if not all(os.path.exists(o) for o in self._outputs(entry)):
+            return False
+
+        stat = os.stat(source)
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        if file_digest(source) == entry["sha256"]:
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._dirty = True
+            return True
+        return False
+
+    def record(self, source, output, settings, digest=None, variants=None):
+        """
+        Registrar una conversión terminada correctamente
+
+        Args:
+            digest (str): Hash del origen si ya se calculó (evita leerlo de nuevo)
+            variants (list): Rutas de todas las variantes generadas (modo variantes)
+        """
+        stat = os.stat(source)
+        self.entries[self._key(source)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest or file_digest(source),
+            "settings": settings,
+            "output": str(output),
+        }
+        if variants:
+            self.entries[self._key(source)]["variants"] = [str(v) for v in variants]
+        self._dirty = True
+
+    def find_stale(self):
+        """Devuelve las parejas (origen, lista de salidas) cuyo archivo de origen ya no existe"""
+        return [
+            (source, self._outputs(entry))
+            for source, entry in self.entries.items()
+            if not os.path.exists(source)
+        ]
+
+    def prune_stale(self):
+        """
+        Elimina las salidas huérfanas y sus entradas del manifiesto.
+
+        Returns:
+            list: Rutas de salida eliminadas
+        """
+        removed = []
+        for source, outputs in self.find_stale():
+            failed = False
+            for output in outputs:
+                try:
+                    os.remove(output)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"No se pudo eliminar {output}: {e}")
+                    failed = True
+                    continue
+                removed.append(output)
+            if not failed:
+                del self.entries[source]
+                self._dirty = True
+        return removed
@@ -0,0 +1,67 @@
+"""
+Estimación de la memoria que necesita convertir una imagen.
+
+Solo se lee la cabecera (tamaño, modo, número de fotogramas); la imagen no se
+decodifica. La estimación es deliberadamente generosa: sirve para decidir
+cuántas imágenes pueden convertirse a la vez sin agotar la memoria.
+"""
+
+from PIL import Image
+
+from animation import is_animated
+
+MB = 1024 * 1024
+
+# Bytes por píxel que ocupa el codificador WebP (imagen ARGB + planos YUV + margen)
+ENCODER_BYTES_PER_PIXEL = 8
+
+def bytes_per_pixel(mode):
+    """Bytes por píxel de una imagen de Pillow en memoria según su modo."""
+    if mode in ("1", "L", "P"):
+        return 1
+    if mode.startswith("I;16"):
+        return 2
+    # RGB, RGBA, LA, CMYK, I, F...: Pillow los guarda con 32 bits por píxel
+    return 4
+
+def _draft_size(size, target):
+    """Tamaño que entrega el decodificador JPEG con `draft()` para llegar a `target`."""
+    width, height = size
+    scale = 1
+    while scale < 8 and width // (scale * 2) >= target[0] and height // (scale * 2) >= target[1]:
+        scale *= 2
+    return -(-width // scale), -(-height // scale)
+
+def estimate_memory(image_path, target_size=None):
+    """
+    Bytes de memoria que se prevé que use la conversión de `image_path`.
+
+    `target_size(tamaño)` devuelve el tamaño al que se reducirá la imagen, o None
+    si se convierte a tamaño original. En los JPEG se tiene en cuenta que
+    `draft()` decodifica ya reducido.
+    """
+    with Image.open(image_path) as img:
+        size = img.size
+        mode = img.mode
+        if is_animated(img):
+            # Fotograma actual, lienzo compuesto y anterior, más el codificador
+            width, height = size
+            return width * height * (4 * 3 + ENCODER_BYTES_PER_PIXEL)
+
+        target = target_size(size) if target_size else None
+        decoded = size
+        if target and img.format == "JPEG":
+            decoded = _draft_size(size, target)
+
+    decoded_pixels = decoded[0] * decoded[1]
+    output_pixels = target[0] * target[1] if target else decoded_pixels
+    total = decoded_pixels * bytes_per_pixel(mode)
+    if target:
+        total += output_pixels * 4
+        if mode in ("P", "1"):
+            # Antes de reducirlas se pasan a RGB/RGBA a tamaño completo
+            total += decoded_pixels * 4
+    if mode not in ("RGB", "RGBA"):
+        # El codificador WebP convierte antes a RGB/RGBA
+        total += output_pixels * 4
+    return total + output_pixels * ENCODER_BYTES_PER_PIXEL
@@ -0,0 +1,68 @@
+"""
+Metadatos (EXIF, XMP, perfil ICC) y orientación EXIF en la conversión a WebP.
+
+Todo se lee de la cabecera que Pillow ya analizó al abrir la imagen, así que
+conservar los metadatos no añade ninguna lectura ni decodificación. La
+orientación se aplica sobre la imagen ya reducida, que es donde girarla cuesta
+menos.
+"""
+
+from PIL import Image
+
+# Etiqueta EXIF de orientación (1 = normal)
+ORIENTATION_TAG = 0x0112
+
+# Transposición que endereza la imagen para cada valor de orientación EXIF
+_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+def exif_orientation(img):
+    """Orientación EXIF de una imagen abierta (1 si no tiene o no es válida)."""
+    try:
+        orientation = img.getexif().get(ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+    return orientation if orientation in _TRANSPOSE else 1
+
+def oriented_size(size, orientation):
+    """Tamaño de la imagen una vez enderezada (las orientaciones 5-8 giran 90°)."""
+    width, height = size
+    return (height, width) if orientation in (5, 6, 7, 8) else (width, height)
+
+def apply_orientation(img, orientation):
+    """Endereza `img` según `orientation`; con 1 devuelve la misma imagen."""
+    method = _TRANSPOSE.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+def metadata_params(img, keep_metadata=False, orientation_applied=False):
+    """
+    Parámetros de `save` de Pillow para copiar al WebP los metadatos de `img`.
+
+    Si la orientación se aplicó a los píxeles, el EXIF de salida la marca como
+    normal (1) para que los visores no vuelvan a girar la imagen.
+
+    Returns:
+        dict: exif, icc_profile y xmp, solo los que la imagen tenga
+    """
+    if not keep_metadata:
+        return {}
+    params = {}
+    icc_profile = img.info.get("icc_profile")
+    if icc_profile:
+        params["icc_profile"] = icc_profile
+    xmp = img.info.get("xmp") or img.info.get("XML:com.adobe.xmp")
+    if xmp:
+        params["xmp"] = xmp.encode("utf-8") if isinstance(xmp, str) else xmp
+    exif = img.getexif()
+    if exif:
+        if orientation_applied and ORIENTATION_TAG in exif:
+            exif[ORIENTATION_TAG] = 1
+        params["exif"] = exif.tobytes()
+    return params
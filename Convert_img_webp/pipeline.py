@@ -0,0 +1,197 @@
+"""
+Pipeline por etapas con colas acotadas: lectura → CPU → escritura.
+
+Un pequeño grupo de hilos de E/S lee los archivos de origen por adelantado y
+escribe los resultados, mientras un grupo de procesos hace el trabajo de CPU.
+Así la CPU no se queda parada esperando al disco (por ejemplo, en unidades de
+red). Las colas entre etapas tienen un tamaño máximo para que la lectura
+anticipada no llene la memoria.
+
+El módulo no sabe nada de imágenes: recibe las funciones de cada etapa.
+"""
+
+import collections
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+def _timed(func, *args, **kwargs):
+    """Ejecuta `func` y devuelve (resultado, segundos). Se usa en hilos y procesos."""
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+class StagedPipeline:
+    """
+    Planificador de tres etapas (lectura, proceso y escritura) con colas acotadas
+    """
+
+    def __init__(self, read, process, write, workers, io_threads=4, queue_depth=None, process_options=None):
+        """
+        Inicializar el pipeline
+
+        Args:
+            read (function): `read(task)` -> datos; se ejecuta en un hilo de E/S
+            process (function): `process(datos, **process_options)` -> resultado; se
+                ejecuta en un proceso del pool, así que debe ser una función de módulo
+            write (function): `write(task, resultado)`; se ejecuta en un hilo de E/S
+            workers (int): Procesos de CPU
+            io_threads (int): Hilos de E/S compartidos por lectura y escritura
+            queue_depth (int): Tamaño máximo de cada cola entre etapas
+            process_options (dict): Argumentos adicionales para `process`
+        """
+        self.read = read
+        self.process = process
+        self.write = write
+        self.workers = workers
+        self.io_threads = io_threads
+        self.queue_depth = queue_depth or workers * 2
+        self.process_options = process_options or {}
+        self.stats = None
+
+    def _reset_stats(self):
+        self.stats = {
+            'items': 0,
+            'failed': 0,
+            'wall_seconds': 0.0,
+            'busy_seconds': {'read': 0.0, 'process': 0.0, 'write': 0.0},
+            'queue_samples': 0,
+            'queue_depth_sum': {'to_process': 0, 'to_write': 0},
+            'queue_depth_max': {'to_process': 0, 'to_write': 0},
+        }
+
+    def _sample_queues(self, to_process, to_write):
+        self.stats['queue_samples'] += 1
+        for name, depth in (('to_process', len(to_process)), ('to_write', len(to_write))):
+            self.stats['queue_depth_sum'][name] += depth
+            self.stats['queue_depth_max'][name] = max(self.stats['queue_depth_max'][name], depth)
+
+    def run(self, tasks):
+        """
+        Procesa las tareas y entrega un diccionario por tarea en cuanto se escribe:
+        {'task', 'data_size', 'value', 'error', 'times': {'read', 'process', 'write'}}.
+
+        Es un generador; `tasks` puede ser un iterador perezoso.
+        """
+        self._reset_stats()
+        start = time.perf_counter()
+        tasks = iter(tasks)
+        exhausted = False
+
+        reading = {}                          # futuro -> tarea
+        to_process = collections.deque()      # (tarea, datos, tiempos)
+        processing = {}                       # futuro -> (tarea, tamaño, tiempos)
+        to_write = collections.deque()        # (tarea, tamaño, resultado, tiempos)
+        writing = {}                          # futuro -> (tarea, tamaño, resultado, tiempos)
+
+        with ThreadPoolExecutor(self.io_threads, thread_name_prefix="pipeline-io") as io_pool, \
+                ProcessPoolExecutor(self.workers) as cpu_pool:
+            while True:
+                # Lectura anticipada mientras quede sitio en la cola hacia la CPU
+                while not exhausted and len(reading) + len(to_process) < self.queue_depth:
+                    try:
+                        task = next(tasks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    reading[io_pool.submit(_timed, self.read, task)] = task
+
+                # A la CPU, sin desbordar la cola hacia la escritura
+                while to_process and len(processing) < self.workers and \
+                        len(processing) + len(to_write) < self.queue_depth:
+                    task, data, times = to_process.popleft()
+                    future = cpu_pool.submit(_timed, self.process, data, **self.process_options)
+                    processing[future] = (task, len(data), times)
+
+                # Escritura, como mucho una por hilo de E/S
+                while to_write and len(writing) < self.io_threads:
+                    task, size, value, times = to_write.popleft()
+                    writing[io_pool.submit(_timed, self.write, task, value)] = (task, size, value, times)
+
+                self._sample_queues(to_process, to_write)
+
+                if not (reading or processing or writing):
+                    if exhausted and not to_process and not to_write:
+                        break
+                    continue
+
+                done, _ = wait(
+                    list(reading) + list(processing) + list(writing),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future in reading:
+                        task = reading.pop(future)
+                        try:
+                            data, elapsed = future.result()
+                        except Exception as e:
+                            yield self._finish(task, 0, None, e, {})
+                            continue
+                        self.stats['busy_seconds']['read'] += elapsed
+                        to_process.append((task, data, {'read': elapsed}))
+
+                    elif future in processing:
+                        task, size, times = processing.pop(future)
+                        try:
+                            value, elapsed = future.result()
+                        except Exception as e:
+                            yield self._finish(task, size, None, e, times)
+                            continue
+                        self.stats['busy_seconds']['process'] += elapsed
+                        to_write.append((task, size, value, dict(times, process=elapsed)))
+
+                    else:
+                        task, size, value, times = writing.pop(future)
+                        try:
+                            _, elapsed = future.result()
+                        except Exception as e:
+                            yield self._finish(task, size, value, e, times)
+                            continue
+                        self.stats['busy_seconds']['write'] += elapsed
+                        yield self._finish(task, size, value, None, dict(times, write=elapsed))
+
+        self.stats['wall_seconds'] = time.perf_counter() - start
+
+    def _finish(self, task, size, value, error, times):
+        self.stats['items'] += 1
+        if error is not None:
+            self.stats['failed'] += 1
+        return {
+            'task': task,
+            'data_size': size,
+            'value': value,
+            'error': None if error is None else str(error),
+            'times': times,
+        }
+
+    def summary(self):
+        """
+        Resumen de la última ejecución: tiempo ocupado y utilización de cada etapa,
+        profundidad media y máxima de las colas, y la etapa que limita el ritmo.
+
+        Una cola hacia la CPU casi siempre llena indica que la lectura va por delante
+        (límite de CPU); casi siempre vacía con la CPU poco ocupada indica límite de E/S.
+        """
+        stats = self.stats
+        wall = stats['wall_seconds'] or 1e-9
+        samples = stats['queue_samples'] or 1
+        utilisation = {
+            'read': stats['busy_seconds']['read'] / (wall * self.io_threads),
+            'process': stats['busy_seconds']['process'] / (wall * self.workers),
+            'write': stats['busy_seconds']['write'] / (wall * self.io_threads),
+        }
+        io_utilisation = max(utilisation['read'], utilisation['write'])
+        return {
+            'items': stats['items'],
+            'failed': stats['failed'],
+            'wall_seconds': stats['wall_seconds'],
+            'workers': self.workers,
+            'io_threads': self.io_threads,
+            'queue_depth_limit': self.queue_depth,
+            'busy_seconds': dict(stats['busy_seconds']),
+            'utilisation': utilisation,
+            'queue_depth_avg': {
+                name: total / samples for name, total in stats['queue_depth_sum'].items()
+            },
+            'queue_depth_max': dict(stats['queue_depth_max']),
+            'bottleneck': 'cpu' if utilisation['process'] >= io_utilisation else 'io',
+        }
@@ -0,0 +1,95 @@
+"""
+Progreso de una conversión para la interfaz.
+
+El hilo de conversión anota cada resultado con `ProgressReporter.update`, que
+solo actualiza unos contadores y nunca toca la interfaz ni espera por ella. La
+interfaz lee un resumen con `snapshot` a intervalos fijos, de modo que miles de
+archivos por segundo se reflejan en unas pocas actualizaciones de pantalla.
+"""
+
+import collections
+import threading
+import time
+
+class ProgressReporter:
+    """
+    Contadores de progreso compartidos entre el hilo de conversión y la interfaz
+    """
+
+    def __init__(self, rate_window=5.0):
+        """
+        Args:
+            rate_window (float): Segundos de historia usados para calcular el ritmo
+        """
+        self._lock = threading.Lock()
+        self.done = 0
+        self.total = 0
+        self.bytes_saved = 0
+        self.start = time.monotonic()
+        self.rate_window = rate_window
+        self._samples = collections.deque()
+
+    def update(self, result):
+        """Anota un registro de `iter_convert_folder` (llamado desde el hilo de conversión)"""
+        if result['status'] == 'stale':
+            return
+        with self._lock:
+            self.done = result['done']
+            self.total = result['total']
+            if result['status'] in ('converted', 'cached'):
+                self.bytes_saved += result['bytes_in'] - result['bytes_out']
+
+    def snapshot(self):
+        """
+        Resumen del progreso (llamado desde la interfaz).
+
+        `files_per_second` es el ritmo de los últimos `rate_window` segundos y
+        `eta_seconds` el tiempo restante a ese ritmo. Mientras la carpeta se sigue
+        recorriendo `total` aún puede crecer, así que el ETA es optimista.
+
+        Returns:
+            dict: done, total, fraction, files_per_second, eta_seconds, bytes_saved
+        """
+        with self._lock:
+            done, total, bytes_saved = self.done, self.total, self.bytes_saved
+
+        now = time.monotonic()
+        self._samples.append((now, done))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.rate_window:
+            self._samples.popleft()
+        first_time, first_done = self._samples[0]
+        if now - first_time > 0:
+            rate = (done - first_done) / (now - first_time)
+        else:
+            rate = 0.0
+        if rate == 0.0 and done and now > self.start:
+            # Sin historia reciente (p. ej. al empezar) se usa el ritmo global
+            rate = done / (now - self.start)
+
+        return {
+            'done': done,
+            'total': total,
+            'fraction': done / total if total else 0.0,
+            'files_per_second': rate,
+            'eta_seconds': (total - done) / rate if rate else None,
+            'bytes_saved': bytes_saved,
+        }
+
+def format_eta(seconds):
+    """Tiempo restante como `m:ss` o `h:mm:ss` ('--:--' si no se conoce)"""
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+def format_bytes(size):
+    """Tamaño legible (B, KB, MB, GB); admite valores negativos"""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
@@ -0,0 +1,34 @@
+"""
+Lectura de las imágenes de origen mediante mapeo en memoria (mmap).
+
+Con un archivo mapeado, el decodificador de Pillow lee directamente de las
+páginas del sistema operativo en lugar de pasar por los búferes de un archivo
+abierto con `open()`. Si el archivo no se puede mapear (vacío, un pipe, algunos
+sistemas de archivos de red) se usa la lectura normal.
+"""
+
+import contextlib
+import mmap
+
+@contextlib.contextmanager
+def open_source(path, use_mmap=True):
+    """
+    Abre una imagen de origen para pasársela a `Image.open`.
+
+    Con `use_mmap=True` entrega el archivo mapeado en memoria (un objeto `mmap`,
+    que Pillow usa como cualquier archivo: read, seek, tell); si el mapeo falla
+    entrega el archivo abierto de forma normal. La imagen debe cargarse por
+    completo dentro del bloque `with`, porque el mapeo se cierra al salir.
+    """
+    with open(path, "rb") as f:
+        if not use_mmap:
+            yield f
+            return
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError: archivo vacío; OSError: no admite mapeo
+            yield f
+            return
+        with mapped:
+            yield mapped
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del conversor se importan por su nombre, como en la aplicación
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
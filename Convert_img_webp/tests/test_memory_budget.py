@@ -0,0 +1,52 @@
+"""Pruebas de la estimación de memoria y del presupuesto de la conversión en paralelo."""
+
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+from converter_img_webp import convert_images_parallel
+from memory_budget import estimate_memory
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def write_header_only_png(path, width, height):
+    """PNG con solo la cabecera: anuncia `width`×`height` píxeles sin contenerlos."""
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(_chunk(b"IDAT", zlib.compress(b"")))
+        f.write(_chunk(b"IEND", b""))
+
+def test_decompression_bomb_is_not_estimated_as_zero(tmp_path):
+    source = tmp_path / "enorme.png"
+    write_header_only_png(source, 30000, 30000)
+    with pytest.raises(Image.DecompressionBombError):
+        estimate_memory(source)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decompression_bomb_is_rejected(tmp_path, workers):
+    source = tmp_path / "enorme.png"
+    write_header_only_png(source, 30000, 30000)
+    small = tmp_path / "pequena.png"
+    Image.new("RGB", (16, 16), "red").save(small)
+
+    results = {
+        result['source'].name: result
+        for result in convert_images_parallel(
+            [(source, tmp_path / "enorme.webp"), (small, tmp_path / "pequena.webp")],
+            workers=workers,
+            memory_budget=4096,
+        )
+    }
+
+    assert results["enorme.png"]['status'] == 'rejected'
+    assert "pixels" in results["enorme.png"]['error']
+    assert results["pequena.png"]['status'] == 'converted'
+    assert not (tmp_path / "enorme.webp").exists()
+
+def test_budget_below_worker_baseline_is_an_error(tmp_path):
+    with pytest.raises(ValueError):
+        list(convert_images_parallel([], workers=4, memory_budget=100))
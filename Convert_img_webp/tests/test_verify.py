@@ -0,0 +1,26 @@
+"""Pruebas de la verificación de las salidas."""
+
+from PIL import Image
+
+import converter_img_webp
+
+def test_failed_verification_removes_output(tmp_path, monkeypatch):
+    input_folder = tmp_path / "entrada"
+    output_folder = tmp_path / "salida"
+    input_folder.mkdir()
+    Image.new("RGB", (32, 24), "blue").save(input_folder / "foto.png")
+
+    monkeypatch.setattr(converter_img_webp, "verify_webp", lambda *args: ["tamaño inesperado"])
+    results = list(converter_img_webp.iter_convert_folder(
+        input_folder, output_folder, workers=1, incremental=True, verify_sample=1.0,
+    ))
+    assert [r['status'] for r in results] == ['failed']
+    assert not (output_folder / "foto.webp").exists()
+
+    # La siguiente ejecución incremental no la da por buena: la vuelve a convertir
+    monkeypatch.undo()
+    results = list(converter_img_webp.iter_convert_folder(
+        input_folder, output_folder, workers=1, incremental=True, verify_sample=1.0,
+    ))
+    assert [r['status'] for r in results] == ['converted']
+    assert results[0]['verified']
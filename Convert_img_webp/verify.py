@@ -0,0 +1,50 @@
+"""
+Verificación de los WebP escritos: se decodifican por completo y se comprueban
+sus dimensiones, para detectar escrituras truncadas o dañadas antes de que
+lleguen a producción.
+"""
+
+import hashlib
+
+from PIL import Image
+
+def is_sampled(source, fraction):
+    """
+    Indica si `source` entra en una muestra de tamaño `fraction` (0 a 1).
+
+    La decisión depende solo de la ruta, así que la misma muestra se repite en
+    cada ejecución y se reparte por igual entre carpetas.
+    """
+    if fraction >= 1:
+        return True
+    if fraction <= 0:
+        return False
+    digest = hashlib.sha1(str(source).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2 ** 32 < fraction
+
+def verify_webp(output_path, expected_size=None, expected_frames=None):
+    """
+    Decodifica un WebP (todos sus fotogramas) y lo compara con lo esperado.
+
+    Returns:
+        list: Descripción de cada problema encontrado (vacía si es correcto)
+    """
+    problems = []
+    try:
+        with Image.open(output_path) as img:
+            if img.format != "WEBP":
+                problems.append(f"{output_path}: formato {img.format}, se esperaba WEBP")
+            if expected_size and img.size != tuple(expected_size):
+                problems.append(
+                    f"{output_path}: {img.size[0]}x{img.size[1]} px, "
+                    f"se esperaba {expected_size[0]}x{expected_size[1]}"
+                )
+            frames = getattr(img, "n_frames", 1)
+            if expected_frames and frames != expected_frames:
+                problems.append(f"{output_path}: {frames} fotogramas, se esperaban {expected_frames}")
+            for frame in range(frames):
+                img.seek(frame)
+                img.load()
+    except Exception as e:
+        problems.append(f"{output_path}: no se puede decodificar ({e})")
+    return problems
@@ -0,0 +1,106 @@
+"""
+Recorrido rápido de carpetas de imágenes basado en `os.scandir`.
+
+Los archivos se entregan de forma perezosa, así que la conversión puede empezar
+antes de terminar de recorrer árboles enormes. El orden es determinista (cada
+carpeta se lista ordenada por nombre), lo que permite resolver siempre igual
+los nombres de salida que chocan entre sí.
+"""
+
+import os
+import pathlib
+
+from config import VALID_EXTENSIONS
+
+def iter_image_files(root, recursive=False, extensions=VALID_EXTENSIONS, exclude=None):
+    """
+    Genera las imágenes de `root` (y de sus subcarpetas si `recursive` es True).
+
+    Todos los archivos de una carpeta se entregan seguidos, antes de bajar a sus
+    subcarpetas. `exclude` es una carpeta que no se recorre (por ejemplo, la de
+    salida cuando está dentro de la de entrada).
+    """
+    exclude = os.path.realpath(exclude) if exclude else None
+    stack = [os.fspath(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"No se pudo leer la carpeta {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and os.path.realpath(entry.path) != exclude:
+                        subdirs.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                    yield pathlib.Path(entry.path)
+            except OSError as e:
+                print(f"No se pudo leer {entry.path}: {e}")
+
+        # Invertidas para que la pila las procese en orden alfabético
+        stack.extend(reversed(subdirs))
+
+def iter_conversion_tasks(input_folder, output_folder, recursive=False, suffix=".webp"):
+    """
+    Genera las parejas (entrada, salida) replicando en `output_folder` la
+    estructura de subcarpetas de `input_folder`.
+
+    Si dos imágenes de una misma carpeta producirían la misma salida (`x.png` y
+    `x.jpg`), la primera en orden alfabético conserva `x.webp` y las demás
+    añaden su extensión original al nombre (`x-jpg.webp`, y `x-jpg-2.webp` si
+    también esa estuviera ocupada).
+    """
+    input_path = pathlib.Path(input_folder)
+    output_path = pathlib.Path(output_folder)
+
+    current_dir = None
+    used_names = set()
+    for image_file in iter_image_files(input_path, recursive, exclude=output_path):
+        if image_file.parent != current_dir:
+            current_dir = image_file.parent
+            used_names = set()
+
+        name = _unique_name(image_file, used_names, suffix)
+        relative_dir = image_file.parent.relative_to(input_path)
+        yield image_file, output_path / relative_dir / name
+
+def _unique_name(image_file, used_names, suffix):
+    """Nombre de salida de `image_file` que no choca con `used_names` (y lo reserva)."""
+    name = image_file.stem + suffix
+    if name.lower() in used_names:
+        base = f"{image_file.stem}-{image_file.suffix[1:].lower()}"
+        name = base + suffix
+        counter = 2
+        while name.lower() in used_names:
+            name = f"{base}-{counter}{suffix}"
+            counter += 1
+    used_names.add(name.lower())
+    return name
+
+def sibling_conversion_tasks(image_files, input_folder, output_folder, suffix=".webp"):
+    """
+    Parejas (entrada, salida) de `image_files` y de las imágenes de sus mismas
+    carpetas con el mismo nombre base, con los mismos nombres de salida que les
+    daría `iter_conversion_tasks`.
+
+    Sirve para convertir archivos sueltos (modo vigilancia): la llegada de
+    `x.jpg` puede cambiar el nombre de salida de un `x.png` ya existente, así
+    que ambos se devuelven. Cada carpeta se lista una sola vez, por muchos
+    archivos suyos que lleguen juntos.
+    """
+    stems_by_dir = {}
+    for image_file in map(pathlib.Path, image_files):
+        stems_by_dir.setdefault(image_file.parent, set()).add(image_file.stem.lower())
+
+    for directory, stems in stems_by_dir.items():
+        relative_dir = directory.relative_to(input_folder)
+        used_names = set()
+        for sibling in iter_image_files(directory):
+            name = _unique_name(sibling, used_names, suffix)
+            if sibling.stem.lower() in stems:
+                yield sibling, pathlib.Path(output_folder) / relative_dir / name
@@ -0,0 +1,230 @@
+"""
+Vigilancia de una carpeta para detectar imágenes nuevas o modificadas.
+
+En Linux se usa inotify (a través de ctypes, sin dependencias externas); en el
+resto de sistemas, o si inotify no está disponible, se recorre la carpeta
+periódicamente comparando tamaño y fecha de modificación.
+
+Un archivo solo se entrega cuando lleva `debounce` segundos sin cambiar, para
+no convertir imágenes que todavía se están copiando o subiendo.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+
+from config import VALID_EXTENSIONS, WATCH_DEBOUNCE, WATCH_POLL_INTERVAL
+from walker import iter_image_files
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+def _is_image(path):
+    return os.path.splitext(path)[1].lower() in VALID_EXTENSIONS
+
+def _signature(path):
+    """(tamaño, fecha de modificación) de un archivo, o None si ya no existe."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+class _Inotify:
+    """Envoltorio mínimo de inotify; lanza OSError si no está disponible."""
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify solo existe en Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self.dirs = {}
+
+    def add(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"No se puede vigilar {directory}")
+        self.dirs[wd] = str(directory)
+
+    def read(self, timeout):
+        """
+        Eventos recibidos en `timeout` segundos como (ruta, máscara); una máscara
+        IN_Q_OVERFLOW indica que se perdieron eventos.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is not None or mask & IN_Q_OVERFLOW:
+                path = os.path.join(directory, os.fsdecode(name)) if directory and name else directory
+                events.append((path, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+class FolderWatcher:
+    """
+    Detecta las imágenes nuevas o modificadas de una carpeta.
+
+    Uso:
+        watcher = FolderWatcher("entrada")
+        while True:
+            for path in watcher.wait_ready(timeout=1.0):
+                ...
+    """
+
+    def __init__(
+        self,
+        folder,
+        recursive=False,
+        debounce=WATCH_DEBOUNCE,
+        poll_interval=WATCH_POLL_INTERVAL,
+        exclude=None,
+        use_inotify=True,
+    ):
+        """
+        Args:
+            folder (str): Carpeta a vigilar
+            recursive (bool): Vigilar también las subcarpetas
+            debounce (float): Segundos que un archivo debe estar sin cambios
+            poll_interval (float): Intervalo entre recorridos sin inotify
+            exclude (str): Carpeta que no se vigila (la de salida, si está dentro)
+            use_inotify (bool): Intentar usar inotify antes que el recorrido periódico
+        """
+        self.folder = pathlib.Path(folder)
+        self.recursive = recursive
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.exclude = os.path.realpath(exclude) if exclude else None
+        self._pending = {}
+        self._inotify = None
+
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._watch_tree(self.folder)
+            except OSError as e:
+                print(f"inotify no disponible, se vigilará recorriendo la carpeta: {e}")
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+
+        # Estado inicial: lo que ya existe no se considera nuevo
+        self._snapshot = {} if self._inotify else self._scan()
+        self._last_scan = time.monotonic()
+
+    @property
+    def backend(self):
+        return "inotify" if self._inotify else "polling"
+
+    def _watch_tree(self, directory):
+        """Añade `directory` (y sus subcarpetas si es recursivo) a inotify."""
+        self._inotify.add(directory)
+        if not self.recursive:
+            return
+        for root, dirs, _files in os.walk(directory):
+            dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != self.exclude]
+            for d in dirs:
+                self._inotify.add(os.path.join(root, d))
+
+    def _scan(self):
+        return {
+            str(path): _signature(path)
+            for path in iter_image_files(self.folder, self.recursive, exclude=self.exclude)
+        }
+
+    def _touch(self, path):
+        """Anota actividad en `path`; el plazo de espera empieza de nuevo."""
+        self._pending[path] = (_signature(path), time.monotonic())
+
+    def _collect_events(self, timeout):
+        if self._inotify:
+            for path, mask in self._inotify.read(timeout):
+                if mask & IN_Q_OVERFLOW:
+                    # Se perdieron eventos: comparar con un recorrido completo
+                    for scanned in self._scan():
+                        self._touch(scanned)
+                elif mask & IN_ISDIR:
+                    if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path)
+                        # Lo que se copió dentro antes de empezar a vigilarla
+                        for image_file in iter_image_files(path, True, exclude=self.exclude):
+                            self._touch(str(image_file))
+                elif _is_image(path):
+                    self._touch(path)
+            return
+
+        time.sleep(min(timeout, max(0.0, self._last_scan + self.poll_interval - time.monotonic())))
+        if time.monotonic() - self._last_scan < self.poll_interval:
+            return
+        snapshot = self._scan()
+        self._last_scan = time.monotonic()
+        for path, signature in snapshot.items():
+            if self._snapshot.get(path) != signature and path not in self._pending:
+                self._touch(path)
+        self._snapshot = snapshot
+
+    def _ready(self):
+        """Archivos que llevan `debounce` segundos sin cambiar."""
+        now = time.monotonic()
+        ready = []
+        for path, (signature, since) in list(self._pending.items()):
+            current = _signature(path)
+            if current is None:
+                del self._pending[path]
+            elif current != signature:
+                self._pending[path] = (current, now)
+            elif now - since >= self.debounce:
+                del self._pending[path]
+                ready.append(pathlib.Path(path))
+        return sorted(ready)
+
+    def wait_ready(self, timeout=1.0):
+        """
+        Espera hasta `timeout` segundos y devuelve las imágenes listas para
+        convertir (lista vacía si no hay ninguna).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            step = min(remaining, self.debounce / 2) if self._pending else remaining
+            self._collect_events(max(0.0, step))
+            ready = self._ready()
+            if ready or time.monotonic() >= deadline:
+                return ready
+
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
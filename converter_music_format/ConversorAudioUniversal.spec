@@ -13,7 +13,11 @@ local_modules = [
     'audio_converter',
     'ffmpeg_manager',
     'ui_components',
-    'conversion_handlers'
+    'conversion_handlers',
+    'batch_engine',
+    'ffmpeg_transcoder',
+    'audio_probe',
+    'manifest'
 ]
 
 # Módulos específicos de pydub que deben incluirse
@@ -64,6 +68,8 @@ tkinter_modules = [
 # Módulos estándar de Python
 standard_modules = [
     'threading',
+    'multiprocessing',
+    'concurrent.futures',
     'urllib',
     'urllib.request',
     'urllib.parse',
@@ -74,6 +80,7 @@ standard_modules = [
     'webbrowser',
     'warnings',
     'json',
+    'hashlib',
     'tempfile',
     'wave',
     'audioop',
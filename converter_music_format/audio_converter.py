@@ -1,10 +1,12 @@
 """
 Módulo principal para la conversión de archivos de audio
-Contiene la lógica de conversión usando pydub y FFmpeg
+Contiene la lógica de conversión usando FFmpeg directamente y pydub como alternativa
 """
 
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tkinter import messagebox
 
@@ -14,7 +16,23 @@ except ImportError:
     messagebox.showerror("Error", "pydub no está instalado. Ejecuta: pip install pydub")
     sys.exit(1)
 
-from config import SUPPORTED_FORMATS, AUDIO_EXTENSIONS
+from config import (
+    SUPPORTED_FORMATS, AUDIO_EXTENSIONS, CONVERSION_ENGINES, DEFAULT_ENGINE, PROBE_THREADS,
+    ENCODE_PROFILES, DEFAULT_PROFILE, MANIFEST_SAVE_INTERVAL
+)
+from audio_probe import ProbeCache
+from batch_engine import iter_parallel
+from manifest import ConversionManifest, file_fingerprint
+from ffmpeg_transcoder import encoder_options, find_ffmpeg, transcode
+
+def _path_key(file_path):
+    """Clave para comparar rutas (absoluta y, en Windows, sin distinguir mayúsculas)"""
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+# Protege la creación perezosa de la caché de metadatos cuando varios hilos la piden
+# a la vez (a nivel de módulo para que el conversor siga siendo serializable)
+_probe_cache_lock = threading.Lock()
 
 
 class AudioConverter:
@@ -22,19 +40,51 @@ class AudioConverter:
     Clase principal para la conversión de archivos de audio
     """
     
-    def __init__(self):
-        """Inicializar el conversor"""
+    def __init__(self, engine=DEFAULT_ENGINE, profile=DEFAULT_PROFILE):
+        """
+        Inicializar el conversor
+        
+        Args:
+            engine (str): Motor de conversión por defecto ('ffmpeg' o 'pydub')
+            profile (str): Perfil de codificación por defecto (clave de ENCODE_PROFILES)
+        """
         self.supported_formats = SUPPORTED_FORMATS
         self.audio_extensions = AUDIO_EXTENSIONS
+        self.encode_profiles = list(ENCODE_PROFILES)
+        self.engine = engine
+        self.profile = profile
+        self._probe_cache = None
+    
+    def __getstate__(self):
+        """El pool de procesos serializa el conversor en cada tarea; la caché de metadatos no viaja"""
+        state = self.__dict__.copy()
+        state['_probe_cache'] = None
+        return state
+    
+    @property
+    def probe_cache(self):
+        """Caché persistente de metadatos (se carga la primera vez que se usa)"""
+        if self._probe_cache is None:
+            with _probe_cache_lock:
+                if self._probe_cache is None:
+                    self._probe_cache = ProbeCache()
+        return self._probe_cache
     
-    def convert_audio_file(self, input_file, output_format, output_dir=None):
+    def convert_audio_file(self, input_file, output_format, output_dir=None, engine=None, profile=None, output_file=None):
         """
         Convertir un archivo de audio al formato especificado
         
+        Con el motor 'ffmpeg' un único proceso de FFmpeg convierte el archivo en
+        streaming; si FFmpeg no está instalado se recurre a pydub, que decodifica
+        el audio completo en memoria (y sin FFmpeg solo sabe leer y escribir WAV).
+        
         Args:
             input_file (str): Ruta del archivo de entrada
             output_format (str): Formato de salida (mp3, wav, etc.)
             output_dir (str): Directorio de salida (opcional)
+            engine (str): Motor de conversión (opcional, por defecto el del conversor)
+            profile (str): Perfil de codificación (opcional, por defecto el del conversor)
+            output_file (str): Ruta de salida (opcional, por defecto la de `output_path_for`)
         
         Returns:
             tuple: (success: bool, result: str) - Éxito y ruta del archivo o mensaje de error
@@ -48,30 +98,112 @@ class AudioConverter:
             if output_format.lower() not in self.supported_formats:
                 return False, f"Formato {output_format} no soportado"
             
-            # Obtener información del archivo
-            input_path = Path(input_file)
-            file_name = input_path.stem
+            engine = engine or self.engine
+            if engine not in CONVERSION_ENGINES:
+                return False, f"Motor {engine} no válido. Opciones: {', '.join(CONVERSION_ENGINES)}"
             
-            # Determinar directorio de salida
-            if output_dir is None:
-                output_dir = input_path.parent
-            else:
+            options = encoder_options(output_format.lower(), profile or self.profile)
+            
+            # Crear directorio de salida si se indicó uno
+            if output_dir is not None:
                 os.makedirs(output_dir, exist_ok=True)
             
             # Crear nombre del archivo de salida
-            output_file = os.path.join(output_dir, f"{file_name}.{output_format.lower()}")
+            output_file = output_file or self.output_path_for(input_file, output_format, output_dir)
             
-            # Cargar el archivo de audio
+            # Conversión directa: FFmpeg lee y escribe sin pasar por Python
+            if engine == 'ffmpeg':
+                ffmpeg = find_ffmpeg()
+                if ffmpeg:
+                    return transcode(input_file, output_file, options, ffmpeg)
+            
+            # Alternativa con pydub: cargar el archivo de audio completo
             audio = AudioSegment.from_file(input_file)
             
             # Convertir y guardar
-            audio.export(output_file, format=output_format.lower())
+            self._export_with_pydub(audio, output_file, output_format.lower(), options)
             
             return True, output_file
             
         except Exception as e:
             return False, str(e)
     
+    def _export_with_pydub(self, audio, output_file, output_format, options):
+        """Exportar con pydub aplicando los ajustes del perfil de codificación"""
+        if options.get('sample_rate'):
+            audio = audio.set_frame_rate(options['sample_rate'])
+        if options.get('channels'):
+            audio = audio.set_channels(options['channels'])
+        
+        # pydub escribe los WAV sin FFmpeg si no se le pasan códec ni parámetros
+        if output_format == 'wav':
+            audio.export(output_file, format='wav')
+            return
+        
+        parameters = []
+        if options.get('quality') is not None:
+            parameters += ['-q:a', str(options['quality'])]
+        if options.get('compression_level') is not None:
+            parameters += ['-compression_level', str(options['compression_level'])]
+        audio.export(
+            output_file,
+            format=options['muxer'],
+            codec=options['codec'],
+            bitrate=options['bitrate'],
+            parameters=parameters or None
+        )
+    
+    def output_path_for(self, input_file, output_format, output_dir=None):
+        """
+        Ruta del archivo que genera la conversión de `input_file`
+        
+        Args:
+            input_file (str): Ruta del archivo de entrada
+            output_format (str): Formato de salida
+            output_dir (str): Directorio de salida (opcional, por defecto el del archivo)
+        
+        Returns:
+            str: Ruta del archivo de salida
+        """
+        input_path = Path(input_file)
+        if output_dir is None:
+            output_dir = input_path.parent
+        return os.path.join(output_dir, f"{input_path.stem}.{output_format.lower()}")
+    
+    def output_paths_for(self, input_files, output_format, output_dir=None):
+        """
+        Rutas de salida de varios archivos sin que dos de ellos compartan salida
+        
+        Si dos archivos generarían la misma salida (`tema.wav` y `tema.flac` a
+        mp3, o `tema.wav` y `sub/tema.wav` con un mismo directorio de salida),
+        el primero por orden de ruta conserva `tema.mp3` y los demás añaden su
+        extensión original (`tema-flac.mp3`, y `tema-flac-2.mp3` si también esa
+        estuviera ocupada). El reparto no depende del orden de `input_files`.
+        
+        Args:
+            input_files (list): Rutas de los archivos de entrada
+            output_format (str): Formato de salida
+            output_dir (str): Directorio de salida (opcional, por defecto el de cada archivo)
+        
+        Returns:
+            dict: Ruta de entrada -> ruta de salida
+        """
+        outputs = {}
+        used = set()
+        for input_file in sorted(set(input_files), key=_path_key):
+            output_file = self.output_path_for(input_file, output_format, output_dir)
+            if _path_key(output_file) in used:
+                base, extension = os.path.splitext(output_file)
+                base = f"{base}-{Path(input_file).suffix[1:].lower()}"
+                output_file = base + extension
+                counter = 2
+                while _path_key(output_file) in used:
+                    output_file = f"{base}-{counter}{extension}"
+                    counter += 1
+            used.add(_path_key(output_file))
+            outputs[input_file] = output_file
+        return outputs
+    
     def find_audio_files(self, directory, include_subdirectories=True):
         """
         Buscar archivos de audio en un directorio
@@ -105,7 +237,93 @@ class AudioConverter:
         
         return audio_files
     
-    def batch_convert(self, input_directory, output_format, output_dir=None, include_subdirectories=True, progress_callback=None):
+    def encoder_settings(self, output_format, engine=None, profile=None):
+        """
+        Ajustes con los que se codificaría una salida (los que guarda el manifiesto)
+        
+        Args:
+            output_format (str): Formato de salida
+            engine (str): Motor de conversión (opcional, por defecto el del conversor)
+            profile (str): Perfil de codificación (opcional, por defecto el del conversor)
+        
+        Returns:
+            dict: Formato, motor efectivo y parámetros del codificador
+        """
+        output_format = output_format.lower()
+        engine = engine or self.engine
+        options = encoder_options(output_format, profile or self.profile)
+        if engine == 'ffmpeg' and find_ffmpeg():
+            return {'format': output_format, 'engine': 'ffmpeg', 'encoder': options}
+        return {'format': output_format, 'engine': 'pydub', 'encoder': options}
+    
+    def iter_batch_convert(self, audio_files, output_format, output_dir=None, workers=None, manifest=None, profile=None):
+        """
+        Convertir una lista de archivos en paralelo
+        
+        Es un generador: entrega el resultado de cada archivo en cuanto termina,
+        en el orden en que acaban las conversiones. Los archivos que generarían
+        la misma salida (p. ej. `tema.wav` y `tema.flac` a mp3) reciben nombres
+        distintos (ver `output_paths_for`).
+        
+        Con `manifest` (modo incremental) se omiten los archivos cuya salida ya
+        existe y se generó a partir del mismo origen con los mismos ajustes, y
+        cada conversión correcta se registra en el manifiesto.
+        
+        Args:
+            audio_files (list): Rutas de los archivos de entrada
+            output_format (str): Formato de salida
+            output_dir (str): Directorio de salida (opcional)
+            workers (int): Procesos simultáneos (por defecto, uno por núcleo)
+            manifest (ConversionManifest): Manifiesto del modo incremental (opcional)
+            profile (str): Perfil de codificación (opcional, por defecto el del conversor)
+        
+        Yields:
+            tuple: (file_path: str, status: str, result: str) - Estado 'converted',
+                   'skipped' o 'failed' y ruta del archivo o mensaje de error
+        """
+        profile = profile or self.profile
+        if profile not in ENCODE_PROFILES:
+            raise ValueError(f"Perfil no válido: {profile}. Opciones: {', '.join(ENCODE_PROFILES)}")
+        settings = self.encoder_settings(output_format, profile=profile) if manifest is not None else None
+        outputs = self.output_paths_for(audio_files, output_format, output_dir)
+        fingerprints = {}
+        pending = []
+        
+        for file_path in dict.fromkeys(audio_files):
+            output_file = outputs[file_path]
+            if manifest is not None:
+                try:
+                    if manifest.is_up_to_date(file_path, output_file, settings):
+                        yield file_path, 'skipped', output_file
+                        continue
+                    # Huella tomada antes de convertir: un cambio durante la conversión se repetirá
+                    fingerprints[file_path] = file_fingerprint(file_path)
+                except OSError:
+                    # El archivo desapareció o no se puede leer; el error se informará al convertirlo
+                    pass
+            pending.append(file_path)
+        
+        tasks = ((file_path, output_format, output_dir, None, profile, outputs[file_path]) for file_path in pending)
+        
+        def output_key(task):
+            return _path_key(task[5])
+        
+        recorded = 0
+        try:
+            for task, (success, result) in iter_parallel(self.convert_audio_file, tasks, workers, key=output_key):
+                file_path = task[0]
+                if success and file_path in fingerprints:
+                    manifest.record(file_path, result, settings, fingerprints.pop(file_path))
+                    recorded += 1
+                    if recorded % MANIFEST_SAVE_INTERVAL == 0:
+                        manifest.save()
+                yield file_path, 'converted' if success else 'failed', result
+        finally:
+            # Lo ya registrado se conserva aunque el lote se interrumpa
+            if manifest is not None:
+                manifest.save()
+    
+    def batch_convert(self, input_directory, output_format, output_dir=None, include_subdirectories=True, progress_callback=None, workers=None, incremental=False, profile=None):
         """
         Convertir todos los archivos de audio en un directorio
         
@@ -114,12 +332,17 @@ class AudioConverter:
             output_format (str): Formato de salida
             output_dir (str): Directorio de salida (opcional)
             include_subdirectories (bool): Incluir subdirectorios
-            progress_callback (function): Función para reportar progreso
+            progress_callback (function): Función para reportar progreso; se llama
+                al terminar cada archivo con (completados, total, nombre)
+            workers (int): Procesos simultáneos (por defecto, uno por núcleo)
+            incremental (bool): Omitir lo ya convertido según el manifiesto, que se
+                guarda en el directorio de salida (o en el de entrada si no hay)
+            profile (str): Perfil de codificación (opcional, por defecto el del conversor)
         
         Returns:
-            dict: Estadísticas de la conversión (converted, failed, total)
+            dict: Estadísticas de la conversión (converted, skipped, failed, total)
         """
-        stats = {'converted': 0, 'failed': 0, 'total': 0}
+        stats = {'converted': 0, 'skipped': 0, 'failed': 0, 'total': 0}
         
         try:
             # Buscar archivos de audio
@@ -129,18 +352,17 @@ class AudioConverter:
             if not audio_files:
                 return stats
             
-            # Convertir cada archivo
-            for i, file_path in enumerate(audio_files):
-                if progress_callback:
-                    progress_callback(i + 1, stats['total'], os.path.basename(file_path))
-                
-                success, result = self.convert_audio_file(file_path, output_format, output_dir)
-                
-                if success:
-                    stats['converted'] += 1
-                else:
-                    stats['failed'] += 1
+            manifest = ConversionManifest(output_dir or input_directory) if incremental else None
+            
+            # Convertir en paralelo; cada resultado llega al terminar su archivo
+            results = self.iter_batch_convert(audio_files, output_format, output_dir, workers, manifest, profile)
+            for done, (file_path, status, result) in enumerate(results, start=1):
+                stats[status] += 1
+                if status == 'failed':
                     print(f"Error convirtiendo {file_path}: {result}")
+                
+                if progress_callback:
+                    progress_callback(done, stats['total'], os.path.basename(file_path))
         
         except Exception as e:
             print(f"Error en conversión por lotes: {e}")
@@ -151,6 +373,9 @@ class AudioConverter:
         """
         Obtener información detallada de un archivo de audio
         
+        Solo se leen las cabeceras con ffprobe (sin decodificar el audio) y el
+        resultado se guarda en la caché de metadatos.
+        
         Args:
             file_path (str): Ruta del archivo
         
@@ -161,13 +386,16 @@ class AudioConverter:
             if not os.path.exists(file_path):
                 return None
             
-            audio = AudioSegment.from_file(file_path)
+            metadata = self.probe_cache.probe(file_path)
+            if metadata is None:
+                return None
             
             info = {
                 'filename': os.path.basename(file_path),
-                'duration_seconds': len(audio) / 1000,
-                'channels': audio.channels,
-                'frame_rate': audio.frame_rate,
+                'duration_seconds': metadata['duration_seconds'],
+                'channels': metadata['channels'],
+                'frame_rate': metadata['frame_rate'],
+                'codec': metadata['codec'],
                 'file_size_mb': os.path.getsize(file_path) / (1024 * 1024)
             }
             
@@ -177,10 +405,30 @@ class AudioConverter:
             print(f"Error obteniendo información del archivo: {e}")
             return None
     
+    def iter_audio_info(self, file_paths, threads=PROBE_THREADS):
+        """
+        Obtener la información de muchos archivos con varios ffprobe a la vez
+        
+        Args:
+            file_paths (list): Rutas de los archivos
+            threads (int): Archivos analizados simultáneamente
+        
+        Yields:
+            tuple: (file_path: str, info: dict o None), en el orden de `file_paths`
+        """
+        # Cargar la caché antes de repartir el trabajo entre los hilos
+        probe_cache = self.probe_cache
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            yield from zip(file_paths, executor.map(self.get_audio_info, file_paths))
+        probe_cache.save()
+    
     def validate_file(self, file_path):
         """
         Validar si un archivo es un archivo de audio válido
         
+        Se comprueba que las cabeceras describan un flujo de audio legible; un
+        archivo truncado con cabeceras correctas se detectará al convertirlo.
+        
         Args:
             file_path (str): Ruta del archivo a validar
         
@@ -196,9 +444,8 @@ class AudioConverter:
             if file_extension not in self.audio_extensions:
                 return False
             
-            # Intentar cargar el archivo
-            AudioSegment.from_file(file_path)
-            return True
+            # Leer las cabeceras del archivo
+            return self.probe_cache.probe(file_path) is not None
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,186 @@
+"""
+Lectura de metadatos de audio sin decodificar para el Conversor de Audio Universal
+Usa ffprobe (solo lee las cabeceras del contenedor) y guarda los resultados en
+una caché persistente indexada por ruta, tamaño y fecha de modificación
+"""
+
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import threading
+import wave
+
+from config import PROBE_CACHE_FILE, PROBE_CACHE_VERSION, PROBE_CACHE_SAVE_EVERY
+
+# Evitar que se abra una consola por cada archivo en Windows
+_CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def find_ffprobe():
+    """
+    Buscar el ejecutable de ffprobe en el PATH
+
+    Returns:
+        str: Ruta de ffprobe o None si no está instalado
+    """
+    return shutil.which("ffprobe")
+
+
+def _probe_with_ffprobe(file_path, ffprobe):
+    """Leer con ffprobe el primer flujo de audio; None si no hay ninguno legible"""
+    completed = subprocess.run(
+        [
+            ffprobe, '-v', 'error', '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name,channels,sample_rate,duration:format=duration,format_name',
+            '-of', 'json', file_path
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        creationflags=_CREATION_FLAGS
+    )
+    if completed.returncode != 0:
+        return None
+
+    data = json.loads(completed.stdout or b"{}")
+    streams = data.get('streams') or []
+    if not streams or not streams[0].get('channels'):
+        return None
+
+    stream = streams[0]
+    container = data.get('format', {})
+    duration = stream.get('duration') or container.get('duration') or 0
+    return {
+        'duration_seconds': float(duration),
+        'channels': int(stream['channels']),
+        'frame_rate': int(stream.get('sample_rate') or 0),
+        'codec': stream.get('codec_name'),
+        'container': container.get('format_name')
+    }
+
+
+def _probe_wav(file_path):
+    """Leer la cabecera de un WAV con la biblioteca estándar (sin ffprobe)"""
+    try:
+        with wave.open(file_path, 'rb') as wav_file:
+            frame_rate = wav_file.getframerate()
+            return {
+                'duration_seconds': wav_file.getnframes() / frame_rate if frame_rate else 0,
+                'channels': wav_file.getnchannels(),
+                'frame_rate': frame_rate,
+                'codec': f"pcm_s{wav_file.getsampwidth() * 8}le",
+                'container': 'wav'
+            }
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+def probe_file(file_path, ffprobe=None):
+    """
+    Leer duración, canales y frecuencia de muestreo sin decodificar el audio
+
+    Sin ffprobe solo se pueden leer archivos WAV (con el módulo `wave`).
+
+    Args:
+        file_path (str): Ruta del archivo
+        ffprobe (str): Ruta de ffprobe (opcional, por defecto se busca en el PATH)
+
+    Returns:
+        dict: duration_seconds, channels, frame_rate, codec y container, o None
+              si el archivo no contiene audio legible
+    """
+    ffprobe = ffprobe or find_ffprobe()
+    if ffprobe:
+        try:
+            return _probe_with_ffprobe(file_path, ffprobe)
+        except (OSError, ValueError):
+            return None
+    return _probe_wav(file_path)
+
+
+class ProbeCache:
+    """
+    Caché persistente de metadatos almacenada como JSON
+
+    Cada entrada guarda el tamaño y la fecha de modificación del archivo; si
+    cualquiera de los dos cambia, la entrada deja de valer y se vuelve a leer.
+    """
+
+    def __init__(self, path=PROBE_CACHE_FILE):
+        """
+        Cargar (o crear vacía) la caché
+
+        Args:
+            path (str): Archivo JSON de la caché
+        """
+        self.path = path
+        self.entries = {}
+        self._changes = 0
+        self._lock = threading.Lock()
+        self.load()
+        atexit.register(self.save)
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def load(self):
+        """Leer la caché desde disco; si no existe o está dañada se empieza de cero"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == PROBE_CACHE_VERSION:
+                self.entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Caché de metadatos ilegible, se reconstruirá: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Escribir la caché en disco (solo si hubo cambios)"""
+        with self._lock:
+            if not self._changes:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": PROBE_CACHE_VERSION, "entries": self.entries}, f)
+                os.replace(tmp_path, self.path)
+                self._changes = 0
+            except OSError as e:
+                print(f"No se pudo guardar la caché de metadatos: {e}")
+
+    def probe(self, file_path, ffprobe=None):
+        """
+        Metadatos de `file_path`, desde la caché si el archivo no ha cambiado
+
+        Los archivos sin audio legible también se recuerdan (como None) para no
+        volver a analizarlos. La caché se guarda sola cada PROBE_CACHE_SAVE_EVERY
+        archivos nuevos y al salir del programa.
+
+        Returns:
+            dict: Metadatos (ver `probe_file`) o None
+        """
+        stat = os.stat(file_path)
+        key = self._key(file_path)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["info"]
+
+        ffprobe = ffprobe or find_ffprobe()
+        info = probe_file(file_path, ffprobe)
+        if info is None and not ffprobe:
+            # Sin ffprobe el fallo no es definitivo: se reintentará cuando esté instalado
+            return None
+        with self._lock:
+            self.entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "info": info}
+            self._changes += 1
+            due = self._changes >= PROBE_CACHE_SAVE_EVERY
+        if due:
+            self.save()
+        return info
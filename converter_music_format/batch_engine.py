@@ -0,0 +1,136 @@
+"""
+Motor de conversión por lotes en paralelo
+Reparte las conversiones entre varios procesos y entrega cada resultado en
+cuanto termina, sin esperar al resto del lote
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config import DEFAULT_WORKERS
+
+
+def _call(func, task):
+    """Ejecutar una tarea en el proceso actual con el mismo contrato que el pool"""
+    try:
+        return func(*task)
+    except Exception as e:
+        return False, str(e)
+
+
+def _outcome(future):
+    """Resultado de una tarea del pool; un proceso caído cuenta como fallo"""
+    try:
+        return future.result()
+    except Exception as e:
+        return False, str(e)
+
+
+def iter_parallel(func, tasks, workers=None, key=None):
+    """
+    Ejecutar `func(*task)` para cada tupla de `tasks` en un pool de procesos
+
+    Es un generador: entrega `(task, (success, result))` en el orden en que
+    terminan las tareas. Solo se mantienen en vuelo unas pocas tareas por
+    proceso, por lo que `tasks` puede ser un iterador perezoso.
+
+    Si un proceso del pool muere (falta de memoria, un fallo del decodificador),
+    el pool se reemplaza y el lote continúa; las tareas que estaban en curso se
+    repiten al final de una en una y solo la que vuelve a tumbar su proceso se
+    entrega como fallida.
+
+    Args:
+        func (function): Función de nivel de módulo o método de un objeto
+            serializable que devuelve (success: bool, result: str)
+        tasks (iterable): Tuplas de argumentos para `func`
+        workers (int): Procesos simultáneos (por defecto, uno por núcleo)
+        key (function): Devuelve el recurso que escribe cada tarea (p. ej. el
+            archivo de salida); dos tareas con la misma clave nunca se
+            ejecutan a la vez
+    """
+    workers = workers or DEFAULT_WORKERS
+
+    # Con un solo proceso no compensa el coste de arrancar el pool
+    if workers == 1:
+        for task in tasks:
+            yield task, _call(func, task)
+        return
+
+    max_pending = workers * 4
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}
+    busy = set()
+    deferred = deque()
+    # Tareas en curso cuando murió un proceso del pool; cualquiera pudo ser la culpable
+    suspects = []
+
+    def replace_pool():
+        nonlocal executor
+        executor.shutdown(wait=False)
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(task):
+        try:
+            future = executor.submit(func, *task)
+        except BrokenProcessPool:
+            # El pool murió antes de que se recogieran sus tareas: estas se
+            # recogerán como sospechosas y el lote sigue en un pool nuevo
+            replace_pool()
+            future = executor.submit(func, *task)
+        pending[future] = (task, executor)
+        if key:
+            busy.add(key(task))
+
+    def wait_some():
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        broken = [future for future in done if isinstance(future.exception(), BrokenProcessPool)]
+        if any(pending[future][1] is executor for future in broken):
+            # El pool ya no sirve y todas sus tareas terminan enseguida: se
+            # recogen juntas y las que quedan siguen en un pool nuevo
+            done, _ = wait(pending)
+            replace_pool()
+        finished = []
+        for future in done:
+            task, _ = pending.pop(future)
+            if key:
+                busy.discard(key(task))
+            if isinstance(future.exception(), BrokenProcessPool):
+                suspects.append(task)
+            else:
+                finished.append((task, _outcome(future)))
+
+        # Lanzar las tareas que esperaban a que se liberara su salida
+        for _ in range(len(deferred)):
+            task = deferred.popleft()
+            if key(task) in busy or len(pending) >= max_pending:
+                deferred.append(task)
+            else:
+                submit(task)
+        return finished
+
+    try:
+        for task in tasks:
+            while len(pending) >= max_pending:
+                yield from wait_some()
+            if key and key(task) in busy:
+                deferred.append(task)
+            else:
+                submit(task)
+
+        while pending:
+            yield from wait_some()
+
+        # Las tareas afectadas por la caída de un proceso se repiten de una en una
+        # para que solo falle la que lo provoca
+        for task in suspects:
+            try:
+                outcome = executor.submit(func, *task).result()
+            except BrokenProcessPool as e:
+                outcome = False, f"El proceso de conversión terminó de forma inesperada: {e}"
+                replace_pool()
+            except Exception as e:
+                outcome = False, str(e)
+            yield task, outcome
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,178 @@
+"""
+Benchmark de los motores de conversión del Conversor de Audio Universal
+
+Compara la transcodificación directa con FFmpeg frente a la conversión con
+pydub (decodificar todo el archivo en memoria y volver a codificarlo). Cada
+conversión se ejecuta en un proceso hijo nuevo, de modo que el pico de memoria
+(RSS) que se informa corresponde solo a esa conversión. Se informa el pico
+del proceso de Python y el pico conjunto con los procesos de FFmpeg que lanza
+(en Linux un hijo hereda en su medición la memoria del padre al crearse, así
+que el pico de FFmpeg por separado no es fiable).
+
+Uso:
+    python benchmark.py [archivo ...] [--duration S] [--formats mp3,flac]
+                        [--profile NOMBRE] [--repeat N] [--json salida.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from config import CONVERSION_ENGINES, SUPPORTED_FORMATS, ENCODE_PROFILES, DEFAULT_PROFILE
+from ffmpeg_transcoder import find_ffmpeg
+
+
+def peak_rss_mb(children=False):
+    """
+    Pico de memoria residente del proceso actual en MB (None si no se puede medir)
+    Con `children=True`, el mayor pico de sus procesos hijos ya terminados
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def run_isolated(func, *args):
+    """Ejecutar `func(*args)` en un proceso hijo recién creado y devolver su resultado"""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+
+def make_test_track(path, duration):
+    """Generar con FFmpeg una pista FLAC estéreo sintética de `duration` segundos"""
+    subprocess.run(
+        [
+            find_ffmpeg(), '-hide_banner', '-nostdin', '-loglevel', 'error', '-y',
+            '-f', 'lavfi', '-i', f"sine=frequency=440:sample_rate=44100:duration={duration}",
+            '-f', 'lavfi', '-i', f"anoisesrc=color=pink:sample_rate=44100:amplitude=0.1:duration={duration}",
+            '-filter_complex', 'amerge=inputs=2', '-ac', '2', '-c:a', 'flac', path
+        ],
+        check=True
+    )
+    return path
+
+
+def _convert_once(input_file, output_format, output_dir, engine, profile):
+    """Medición en el proceso hijo: una conversión con el motor y perfil indicados"""
+    from audio_converter import AudioConverter
+
+    converter = AudioConverter(engine=engine, profile=profile)
+    start = time.perf_counter()
+    success, result = converter.convert_audio_file(input_file, output_format, output_dir)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'success': success,
+        'error': None if success else result,
+        'seconds': elapsed,
+        'python_rss_mb': peak_rss_mb(),
+        'peak_rss_mb': max(peak_rss_mb() or 0, peak_rss_mb(children=True) or 0) or None,
+        'output_bytes': os.path.getsize(result) if success else 0
+    }
+
+
+def benchmark_engines(files, formats, repeat, profile=DEFAULT_PROFILE):
+    """Medir cada archivo y formato con todos los motores (mejor tiempo de `repeat`)"""
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for input_file in files:
+            for output_format in formats:
+                for engine in CONVERSION_ENGINES:
+                    runs = [
+                        run_isolated(_convert_once, input_file, output_format, output_dir, engine, profile)
+                        for _ in range(repeat)
+                    ]
+                    best = min(runs, key=lambda run: run['seconds'])
+                    best.update({
+                        'file': os.path.basename(input_file),
+                        'input_bytes': os.path.getsize(input_file),
+                        'format': output_format,
+                        'engine': engine,
+                        'profile': profile
+                    })
+                    results.append(best)
+    return results
+
+
+def _mb(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def _print_results(results):
+    print(f"{'archivo':<24} {'fmt':<5} {'motor':<7} {'tiempo':>8} {'RSS py':>8} {'RSS pico':>8} {'salida':>9}")
+    for r in results:
+        if not r['success']:
+            print(f"{r['file']:<24} {r['format']:<5} {r['engine']:<7} error: {r['error']}")
+            continue
+        print(
+            f"{r['file']:<24} {r['format']:<5} {r['engine']:<7} {r['seconds']:>7.2f}s "
+            f"{_mb(r['python_rss_mb']):>6}MB {_mb(r['peak_rss_mb']):>6}MB "
+            f"{r['output_bytes'] / (1024 * 1024):>7.1f}MB"
+        )
+
+    # Resumen: ffmpeg frente a pydub para cada archivo y formato
+    by_key = {(r['file'], r['format'], r['engine']): r for r in results if r['success']}
+    for (name, output_format, engine), direct in by_key.items():
+        fallback = by_key.get((name, output_format, 'pydub'))
+        if engine != 'ffmpeg' or fallback is None:
+            continue
+        speedup = fallback['seconds'] / direct['seconds'] if direct['seconds'] else 0
+        print(
+            f"{name} -> {output_format}: ffmpeg {speedup:.1f}x más rápido, "
+            f"RSS de Python {_mb(fallback['python_rss_mb'])}MB -> {_mb(direct['python_rss_mb'])}MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de conversión de audio")
+    parser.add_argument("files", nargs="*", help="Archivos a medir (si no se indica, se genera uno)")
+    parser.add_argument("--duration", type=int, default=600,
+                        help="Duración en segundos de la pista sintética")
+    parser.add_argument("--formats", default="mp3,flac",
+                        help=f"Formatos de salida separados por comas ({', '.join(SUPPORTED_FORMATS)})")
+    parser.add_argument("--profile", choices=list(ENCODE_PROFILES), default=DEFAULT_PROFILE,
+                        help="Perfil de codificación")
+    parser.add_argument("--repeat", type=int, default=1, help="Pasadas por motor (se toma la mejor)")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo JSON")
+    args = parser.parse_args()
+
+    formats = [fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if unknown:
+        parser.error(f"Formatos no soportados: {', '.join(unknown)}")
+    if find_ffmpeg() is None:
+        parser.error("FFmpeg no está instalado o no está en el PATH")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = args.files or [make_test_track(os.path.join(tmp_dir, "sintetico.flac"), args.duration)]
+        results = benchmark_engines(files, formats, args.repeat, args.profile)
+
+    _print_results(results)
+
+    if args.json:
+        report = {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'results': results
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 Configuración y constantes para el Conversor de Audio Universal
 """
 
+import os
 import customtkinter as ctk
 import warnings
 
@@ -16,6 +17,77 @@ SUPPORTED_FORMATS = ['mp3', 'wav', 'ogg', 'flac', 'm4a', 'aac', 'wma']
 # Extensiones de archivos de audio
 AUDIO_EXTENSIONS = ['.mp3', '.wav', '.ogg', '.flac', '.m4a', '.aac', '.wma']
 
+# Parámetros de FFmpeg por formato de salida para la conversión directa:
+# códec de audio, bitrate (None en los formatos sin pérdida) y contenedor (-f)
+FFMPEG_FORMATS = {
+    'mp3': {'codec': 'libmp3lame', 'bitrate': '192k', 'muxer': 'mp3'},
+    'wav': {'codec': 'pcm_s16le', 'bitrate': None, 'muxer': 'wav'},
+    'ogg': {'codec': 'libvorbis', 'bitrate': '192k', 'muxer': 'ogg'},
+    'flac': {'codec': 'flac', 'bitrate': None, 'muxer': 'flac'},
+    'm4a': {'codec': 'aac', 'bitrate': '192k', 'muxer': 'ipod'},
+    'aac': {'codec': 'aac', 'bitrate': '192k', 'muxer': 'adts'},
+    'wma': {'codec': 'wmav2', 'bitrate': '192k', 'muxer': 'asf'}
+}
+
+# Perfiles de codificación: ajustes que se aplican sobre FFMPEG_FORMATS.
+# 'options' vale para todos los formatos y 'formats' para uno concreto; los
+# formatos que un perfil no menciona usan sus ajustes por defecto. Claves:
+# bitrate (CBR), quality (VBR, -q:a), compression_level (FLAC), sample_rate y
+# channels. bitrate y quality solo se aplican a los formatos con pérdida.
+ENCODE_PROFILES = {
+    'default': {
+        'description': "Ajustes por defecto de cada formato"
+    },
+    'voice-64k': {
+        'description': "Voz y podcasts: mono, 22,05 kHz y 64 kbps",
+        'options': {'bitrate': '64k', 'sample_rate': 22050, 'channels': 1}
+    },
+    'music-vbr-v2': {
+        'description': "Música con bitrate variable de alta calidad (MP3 V2, Vorbis q6)",
+        'formats': {
+            'mp3': {'quality': 2},
+            'ogg': {'quality': 6}
+        }
+    },
+    'music-cbr-320': {
+        'description': "Música a bitrate constante máximo (320 kbps; AAC a 256 kbps)",
+        'options': {'bitrate': '320k'},
+        'formats': {
+            'm4a': {'bitrate': '256k'},
+            'aac': {'bitrate': '256k'}
+        }
+    },
+    'archive-flac-8': {
+        'description': "Archivo sin pérdida: FLAC con la compresión máxima (más lento)",
+        'formats': {'flac': {'compression_level': 8}}
+    },
+    'fast-flac-0': {
+        'description': "FLAC con la compresión mínima (más rápido, archivos mayores)",
+        'formats': {'flac': {'compression_level': 0}}
+    }
+}
+DEFAULT_PROFILE = 'default'
+
+# Motores de conversión: 'ffmpeg' transcodifica en un solo proceso sin cargar
+# el audio en memoria; 'pydub' decodifica todo el archivo en Python
+CONVERSION_ENGINES = ['ffmpeg', 'pydub']
+DEFAULT_ENGINE = 'ffmpeg'
+
+# Caché persistente de metadatos (ffprobe), indexada por ruta, tamaño y fecha
+PROBE_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".conversor_audio", "probe_cache.json")
+PROBE_CACHE_VERSION = 1
+PROBE_CACHE_SAVE_EVERY = 200  # Guardar tras este número de archivos nuevos
+PROBE_THREADS = 8  # Procesos de ffprobe simultáneos al analizar muchos archivos
+
+# Manifiesto de la conversión incremental por lotes
+MANIFEST_FILENAME = ".audio_manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_SAVE_INTERVAL = 25  # Guardar tras este número de conversiones
+FINGERPRINT_SAMPLE = 64 * 1024  # Bytes del principio y del final que entran en la huella
+
+# Conversión por lotes en paralelo: procesos simultáneos por defecto
+DEFAULT_WORKERS = os.cpu_count() or 1
+
 # Configuración de colores del tema
 COLORS = {
     'primary_green': '#00ff88',
@@ -83,6 +155,8 @@ INFO_TEXT = {
 🔧 Características:
  • Conversión de archivos individuales
  • Conversión por lotes de carpetas completas
+ • Varias conversiones simultáneas en los lotes
+ • Perfiles de calidad (voz, música VBR/CBR, FLAC de archivo)
  • Soporte para múltiples formatos de audio
  • Interfaz moderna y fácil de usar
  • Procesamiento en segundo plano
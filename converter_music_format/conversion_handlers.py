@@ -7,7 +7,8 @@ import os
 import threading
 from tkinter import messagebox
 
-from config import MESSAGES
+from config import MESSAGES, DEFAULT_WORKERS
+from manifest import ConversionManifest
 
 
 class ConversionHandlers:
@@ -59,7 +60,7 @@ class ConversionHandlers:
             
             # Realizar conversión
             success, result = self.app.converter.convert_audio_file(
-                input_file, output_format, output_dir
+                input_file, output_format, output_dir, profile=self.app.single_profile_var.get()
             )
             
             # Finalizar
@@ -124,7 +125,7 @@ class ConversionHandlers:
                 return
             
             # Realizar conversión por lotes
-            stats = self._process_batch_files(audio_files, output_format)
+            stats = self._process_batch_files(audio_files, output_format, input_dir)
             
             # Mostrar resultados
             self._show_batch_results(stats)
@@ -132,30 +133,41 @@ class ConversionHandlers:
         except Exception as e:
             self._handle_batch_conversion_error(str(e))
     
-    def _process_batch_files(self, audio_files, output_format):
-        """Procesar archivos en lote"""
+    def _process_batch_files(self, audio_files, output_format, input_dir=None):
+        """Procesar archivos en lote, en paralelo según los procesos elegidos"""
         total_files = len(audio_files)
-        converted = 0
-        failed = 0
+        stats = {'converted': 0, 'skipped': 0, 'failed': 0, 'total': total_files}
         
-        for i, file_path in enumerate(audio_files):
-            # Actualizar progreso
-            progress = (i + 1) / total_files
-            self.app.progress_bar.set(progress)
+        # Modo incremental: el manifiesto se guarda en la carpeta de origen
+        manifest = None
+        if input_dir and self.app.incremental_var is not None and self.app.incremental_var.get():
+            manifest = ConversionManifest(input_dir)
+        
+        self.app.update_status(f"Convirtiendo {total_files} archivos...")
+        results = self.app.converter.iter_batch_convert(
+            audio_files, output_format, workers=self._batch_workers(), manifest=manifest,
+            profile=self.app.batch_profile_var.get()
+        )
+        
+        for done, (file_path, status, result) in enumerate(results, start=1):
+            stats[status] += 1
+            if status == 'failed':
+                print(f"Error convirtiendo {file_path}: {result}")
             
+            # Actualizar progreso al terminar cada archivo
+            self.app.progress_bar.set(done / total_files)
             file_name = os.path.basename(file_path)
-            self.app.update_status(f"Convirtiendo {i+1}/{total_files}: {file_name}")
-            
-            # Convertir archivo
-            success, result = self.app.converter.convert_audio_file(file_path, output_format)
-            
-            if success:
-                converted += 1
-            else:
-                failed += 1
-                print(f"Error convirtiendo {file_path}: {result}")
+            action = "Omitido" if status == 'skipped' else "Convertido"
+            self.app.update_status(f"{action} {done}/{total_files}: {file_name}")
         
-        return {'converted': converted, 'failed': failed, 'total': total_files}
+        return stats
+    
+    def _batch_workers(self):
+        """Procesos simultáneos elegidos en la pestaña de lotes"""
+        try:
+            return max(1, int(self.app.batch_workers_var.get()))
+        except (AttributeError, ValueError):
+            return DEFAULT_WORKERS
     
     def _show_batch_results(self, stats):
         """Mostrar resultados de conversión por lotes"""
@@ -165,6 +177,7 @@ class ConversionHandlers:
         result_message = (
             f"Conversión por lotes finalizada:\n\n"
             f"✅ Archivos convertidos: {stats['converted']}\n"
+            f"⏭️ Archivos omitidos (ya convertidos): {stats.get('skipped', 0)}\n"
             f"❌ Archivos fallidos: {stats['failed']}\n"
             f"📁 Total procesados: {stats['total']}"
         )
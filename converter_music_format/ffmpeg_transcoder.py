@@ -0,0 +1,138 @@
+"""
+Transcodificación directa con FFmpeg para el Conversor de Audio Universal
+Un solo proceso de FFmpeg lee el archivo de entrada y escribe el de salida en
+streaming, sin pasar el audio decodificado por la memoria de Python
+"""
+
+import os
+import shutil
+import subprocess
+
+from config import FFMPEG_FORMATS, ENCODE_PROFILES, DEFAULT_PROFILE
+
+# Evitar que se abra una consola por cada conversión en Windows
+_CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def find_ffmpeg():
+    """
+    Buscar el ejecutable de FFmpeg en el PATH
+
+    Returns:
+        str: Ruta de FFmpeg o None si no está instalado
+    """
+    return shutil.which("ffmpeg")
+
+
+def encoder_options(output_format, profile=DEFAULT_PROFILE):
+    """
+    Ajustes del codificador para un formato con un perfil de ENCODE_PROFILES
+
+    Args:
+        output_format (str): Formato de salida (clave de FFMPEG_FORMATS)
+        profile (str): Nombre del perfil
+
+    Returns:
+        dict: codec, muxer, bitrate y, si el perfil los fija, quality,
+              compression_level, sample_rate y channels
+    """
+    if profile not in ENCODE_PROFILES:
+        raise ValueError(f"Perfil no válido: {profile}. Opciones: {', '.join(ENCODE_PROFILES)}")
+
+    base = FFMPEG_FORMATS[output_format]
+    spec = ENCODE_PROFILES[profile]
+    overrides = {**spec.get('options', {}), **spec.get('formats', {}).get(output_format, {})}
+
+    # Los formatos sin pérdida no tienen bitrate ni calidad que ajustar
+    if base['bitrate'] is None:
+        overrides.pop('bitrate', None)
+        overrides.pop('quality', None)
+
+    options = {**base, **overrides}
+    if options.get('quality') is not None:
+        options['bitrate'] = None
+    return options
+
+
+def build_command(ffmpeg, input_file, output_file, options):
+    """
+    Construir la línea de comandos de FFmpeg para una conversión
+
+    Args:
+        ffmpeg (str): Ruta del ejecutable de FFmpeg
+        input_file (str): Ruta del archivo de entrada
+        output_file (str): Ruta del archivo de salida
+        options (dict): Ajustes del codificador (ver `encoder_options`)
+
+    Returns:
+        list: Argumentos para subprocess
+    """
+    command = [
+        ffmpeg, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y',
+        '-i', input_file,
+        '-vn',  # Descartar carátulas y vídeo
+        '-c:a', options['codec']
+    ]
+    if options.get('quality') is not None:
+        command += ['-q:a', str(options['quality'])]
+    elif options['bitrate']:
+        command += ['-b:a', options['bitrate']]
+    if options.get('compression_level') is not None:
+        command += ['-compression_level', str(options['compression_level'])]
+    if options.get('sample_rate'):
+        command += ['-ar', str(options['sample_rate'])]
+    if options.get('channels'):
+        command += ['-ac', str(options['channels'])]
+    command += ['-f', options['muxer'], output_file]
+    return command
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def transcode(input_file, output_file, options, ffmpeg=None):
+    """
+    Convertir un archivo con un único proceso de FFmpeg
+
+    La salida se escribe en un archivo temporal junto al destino y se renombra
+    al terminar, así que un fallo no deja archivos a medias y la salida puede
+    coincidir con la entrada (p. ej. mp3 a mp3 en la misma carpeta).
+
+    Args:
+        input_file (str): Ruta del archivo de entrada
+        output_file (str): Ruta del archivo de salida
+        options (dict): Ajustes del codificador (ver `encoder_options`)
+        ffmpeg (str): Ruta de FFmpeg (opcional, por defecto se busca en el PATH)
+
+    Returns:
+        tuple: (success: bool, result: str) - Éxito y ruta del archivo o mensaje de error
+    """
+    ffmpeg = ffmpeg or find_ffmpeg()
+    if ffmpeg is None:
+        return False, "FFmpeg no está instalado"
+
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    command = build_command(ffmpeg, input_file, temp_file, options)
+
+    try:
+        completed = subprocess.run(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            creationflags=_CREATION_FLAGS
+        )
+    except OSError as e:
+        _remove(temp_file)
+        return False, str(e)
+
+    if completed.returncode != 0:
+        _remove(temp_file)
+        message = completed.stderr.decode(errors='replace').strip()
+        return False, message or f"FFmpeg terminó con código {completed.returncode}"
+
+    os.replace(temp_file, output_file)
+    return True, output_file
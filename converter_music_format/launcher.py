@@ -6,6 +6,7 @@ Diseñado específicamente para funcionar con PyInstaller
 
 import sys
 import os
+import multiprocessing
 
 def setup_environment():
     """Configurar el entorno para la aplicación"""
@@ -54,4 +55,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Los procesos del pool relanzan el ejecutable; freeze_support los atiende
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -4,6 +4,7 @@ Clase principal que coordina todos los componentes
 """
 
 import os
+import multiprocessing
 import customtkinter as ctk
 from tkinter import messagebox
 
@@ -65,7 +66,11 @@ class AudioConverterGUI:
         self.output_folder_path = ctk.StringVar()
         self.single_format_var = None
         self.batch_format_var = None
+        self.single_profile_var = None
+        self.batch_profile_var = None
         self.include_subfolders = None
+        self.batch_workers_var = None
+        self.incremental_var = None
         
         # Referencias a elementos UI (se inicializan en setup_ui)
         self.single_file_entry = None
@@ -174,4 +179,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Manifiesto persistente para la conversión incremental por lotes
+Guarda, por cada archivo de salida, el archivo de origen, su huella (tamaño,
+fecha de modificación y un hash de muestras del contenido), el formato y los
+ajustes del codificador, de modo que una nueva ejecución solo convierta lo
+nuevo, lo modificado o lo que se pidió con otros ajustes
+"""
+
+import hashlib
+import json
+import os
+
+from config import MANIFEST_FILENAME, MANIFEST_VERSION, FINGERPRINT_SAMPLE
+
+
+def file_fingerprint(file_path):
+    """
+    Huella rápida de un archivo de audio
+
+    En lugar de leer todo el archivo (cientos de MB en un FLAC largo), el hash
+    cubre el tamaño y los primeros y últimos FINGERPRINT_SAMPLE bytes, donde
+    están las cabeceras, las etiquetas y el final del flujo de audio.
+
+    Returns:
+        dict: size, mtime_ns y sample (hash SHA-256 de las muestras)
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256(str(stat.st_size).encode())
+    with open(file_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE))
+        if stat.st_size > 2 * FINGERPRINT_SAMPLE:
+            f.seek(-FINGERPRINT_SAMPLE, os.SEEK_END)
+            digest.update(f.read(FINGERPRINT_SAMPLE))
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sample': digest.hexdigest()}
+
+
+class ConversionManifest:
+    """
+    Manifiesto de conversiones almacenado como JSON
+
+    Las entradas se indexan por archivo de salida, así que un mismo origen
+    convertido a varios formatos tiene una entrada por formato.
+    """
+
+    def __init__(self, folder):
+        """
+        Cargar (o crear vacío) el manifiesto de una carpeta
+
+        Args:
+            folder (str): Carpeta de salida, o la de origen si las salidas se
+                guardan junto a cada archivo
+        """
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.entries = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def load(self):
+        """Leer el manifiesto desde disco; si no existe o está dañado se empieza de cero"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Manifiesto ilegible, se reconstruirá: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Escribir el manifiesto en disco (solo si hubo cambios)"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def is_up_to_date(self, source, output, settings):
+        """
+        Indicar si `output` se generó a partir de `source` y sigue siendo válida
+
+        Se compara primero tamaño y fecha de modificación; solo si la fecha cambió
+        pero el tamaño no, se recalcula la huella para descartar un simple `touch`.
+
+        Args:
+            source (str): Archivo de origen
+            output (str): Archivo de salida que se generaría ahora
+            settings (dict): Formato y ajustes del codificador que se usarían ahora
+        """
+        entry = self.entries.get(self._key(output))
+        if entry is None:
+            return False
+        if entry["source"] != self._key(source) or entry["settings"] != settings:
+            return False
+        if not os.path.exists(output):
+            return False
+
+        stat = os.stat(source)
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        if file_fingerprint(source)["sample"] == entry["sample"]:
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._dirty = True
+            return True
+        return False
+
+    def record(self, source, output, settings, fingerprint=None):
+        """
+        Registrar una conversión terminada correctamente
+
+        Args:
+            source (str): Archivo de origen
+            output (str): Archivo de salida generado
+            settings (dict): Formato y ajustes del codificador usados
+            fingerprint (dict): Huella del origen tomada antes de convertirlo
+                (si cambió durante la conversión, la próxima ejecución lo repetirá)
+        """
+        self.entries[self._key(output)] = {
+            "source": self._key(source),
+            **(fingerprint or file_fingerprint(source)),
+            "settings": settings
+        }
+        self._dirty = True
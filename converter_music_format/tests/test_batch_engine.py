@@ -0,0 +1,24 @@
+"""Pruebas del motor de conversión por lotes en paralelo"""
+
+import os
+
+from batch_engine import iter_parallel
+
+
+def _convert(name):
+    """Conversión simulada: `crash` tumba su proceso como lo haría un fallo de FFmpeg/pydub"""
+    if name == "crash":
+        os._exit(137)
+    return True, name.upper()
+
+
+def test_worker_crash_only_fails_the_culprit():
+    names = [f"tema{i:02d}" for i in range(21)]
+    names.insert(5, "crash")
+
+    results = {task[0]: outcome for task, outcome in iter_parallel(_convert, [(n,) for n in names], workers=3)}
+
+    assert set(results) == set(names)
+    assert results.pop("crash")[0] is False
+    assert results == {name: (True, name.upper()) for name in names if name != "crash"}
+
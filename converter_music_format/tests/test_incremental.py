@@ -0,0 +1,42 @@
+"""Pruebas del modo incremental de la conversión por lotes"""
+
+import os
+import wave
+
+from audio_converter import AudioConverter
+from manifest import ConversionManifest
+
+
+def _write_wav(path, frames=800):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(b"\0\1" * frames)
+
+
+def _run(converter, files, output_dir):
+    manifest = ConversionManifest(output_dir)
+    results = converter.iter_batch_convert(files, "wav", output_dir, workers=1, manifest=manifest)
+    return sorted((os.path.relpath(path, os.path.dirname(output_dir)), status, result)
+                  for path, status, result in results)
+
+
+def test_colliding_outputs_settle(tmp_path):
+    input_dir = tmp_path / "entrada"
+    output_dir = str(tmp_path / "salida")
+    files = [str(input_dir / "tema.wav"), str(input_dir / "sub" / "tema.wav")]
+    _write_wav(files[0], 800)
+    _write_wav(files[1], 1600)
+    converter = AudioConverter(engine="pydub")
+
+    first = _run(converter, files, output_dir)
+    assert [status for _, status, _ in first] == ["converted", "converted"]
+    outputs = {os.path.basename(result) for _, _, result in first}
+    assert outputs == {"tema.wav", "tema-wav.wav"}
+
+    # Cada origen conserva su salida: la siguiente pasada no repite nada
+    second = _run(converter, list(reversed(files)), output_dir)
+    assert [status for _, status, _ in second] == ["skipped", "skipped"]
+    assert {path: result for path, _, result in first} == {path: result for path, _, result in second}
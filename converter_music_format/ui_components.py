@@ -7,7 +7,47 @@ import os
 import customtkinter as ctk
 from tkinter import filedialog
 
-from config import COLORS, UI_CONFIG, FILE_TYPES, INFO_TEXT
+from config import COLORS, UI_CONFIG, FILE_TYPES, INFO_TEXT, DEFAULT_WORKERS, ENCODE_PROFILES, DEFAULT_PROFILE
+
+
+def create_profile_selection(parent, app_instance):
+    """
+    Crear el selector de perfil de codificación con su descripción
+    
+    Args:
+        parent: Frame donde agregar el selector
+        app_instance: Instancia de la aplicación principal
+    
+    Returns:
+        ctk.StringVar: Variable con el perfil elegido
+    """
+    profile_frame = ctk.CTkFrame(parent, fg_color="transparent")
+    profile_frame.pack(fill="x", padx=20, pady=10)
+    
+    ctk.CTkLabel(profile_frame, text="Perfil de calidad:", font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 10))
+    
+    profile_var = ctk.StringVar(value=DEFAULT_PROFILE)
+    description_label = ctk.CTkLabel(
+        profile_frame,
+        text=ENCODE_PROFILES[DEFAULT_PROFILE]['description'],
+        font=ctk.CTkFont(size=12),
+        text_color=COLORS['gray']
+    )
+    
+    profile_menu = ctk.CTkOptionMenu(
+        profile_frame,
+        variable=profile_var,
+        values=app_instance.converter.encode_profiles,
+        command=lambda name: description_label.configure(text=ENCODE_PROFILES[name]['description']),
+        width=150,
+        fg_color=COLORS['secondary_green'],
+        button_color=COLORS['hover_green'],
+        button_hover_color=COLORS['button_green']
+    )
+    profile_menu.pack(side="left")
+    description_label.pack(side="left", padx=(10, 0))
+    
+    return profile_var
 
 
 class SingleFileTab:
@@ -80,6 +120,7 @@ class SingleFileTab:
         ).pack(pady=(15, 10))
         
         self._create_format_selection(config_frame)
+        self.app.single_profile_var = create_profile_selection(config_frame, self.app)
         self._create_output_directory_selection(config_frame)
         self._create_convert_button(config_frame)
     
@@ -233,7 +274,10 @@ class BatchTab:
         ).pack(pady=(15, 10))
         
         self._create_batch_format_selection(batch_config_frame)
+        self.app.batch_profile_var = create_profile_selection(batch_config_frame, self.app)
+        self._create_workers_selection(batch_config_frame)
         self._create_subfolder_option(batch_config_frame)
+        self._create_incremental_option(batch_config_frame)
         self._create_batch_convert_button(batch_config_frame)
     
     def _create_batch_format_selection(self, parent):
@@ -255,6 +299,25 @@ class BatchTab:
         )
         batch_format_menu.pack(side="left")
     
+    def _create_workers_selection(self, parent):
+        """Crear selector de procesos simultáneos para lotes"""
+        workers_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        workers_frame.pack(fill="x", padx=20, pady=10)
+        
+        ctk.CTkLabel(workers_frame, text="Conversiones simultáneas:", font=ctk.CTkFont(size=14)).pack(side="left", padx=(0, 10))
+        
+        self.app.batch_workers_var = ctk.StringVar(value=str(DEFAULT_WORKERS))
+        workers_menu = ctk.CTkOptionMenu(
+            workers_frame,
+            variable=self.app.batch_workers_var,
+            values=[str(n) for n in range(1, DEFAULT_WORKERS + 1)],
+            width=150,
+            fg_color=COLORS['secondary_green'],
+            button_color=COLORS['hover_green'],
+            button_hover_color=COLORS['button_green']
+        )
+        workers_menu.pack(side="left")
+    
     def _create_subfolder_option(self, parent):
         """Crear checkbox para incluir subcarpetas"""
         self.app.include_subfolders = ctk.BooleanVar(value=True)
@@ -268,6 +331,19 @@ class BatchTab:
         )
         subfolder_check.pack(padx=20, pady=10, anchor="w")
     
+    def _create_incremental_option(self, parent):
+        """Crear checkbox para omitir los archivos ya convertidos"""
+        self.app.incremental_var = ctk.BooleanVar(value=False)
+        incremental_check = ctk.CTkCheckBox(
+            parent,
+            text="Omitir archivos ya convertidos con los mismos ajustes",
+            variable=self.app.incremental_var,
+            font=ctk.CTkFont(size=14),
+            checkbox_width=20,
+            checkbox_height=20
+        )
+        incremental_check.pack(padx=20, pady=10, anchor="w")
+    
     def _create_batch_convert_button(self, parent):
         """Crear botón de conversión por lotes"""
         batch_convert_btn = ctk.CTkButton(